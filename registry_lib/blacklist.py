@@ -1,5 +1,7 @@
 """Blacklist operations."""
 
+import re
+
 from registry_lib.registry import Registry
 from registry_lib.utils import now_iso8601
 
@@ -10,6 +12,7 @@ def add_blacklist(
     uuid: str | None = None,
     url_regex: str | None = None,
     reason: str | None = None,
+    now: str | None = None,
 ) -> dict[str, str]:
     """Add entry to blacklist.
 
@@ -19,12 +22,13 @@ def add_blacklist(
         uuid: Plugin UUID to blacklist (optional)
         url_regex: URL regex pattern to blacklist (optional)
         reason: Reason for blacklisting (required)
+        now: Timestamp to use for blacklisted_at (optional, defaults to current time)
 
     Returns:
         dict: Blacklist entry
 
     Raises:
-        ValueError: If no identifier provided or no reason given
+        ValueError: If no identifier provided, no reason given or url_regex is invalid
     """
     if not reason:
         raise ValueError("Reason is required for blacklisting")
@@ -32,9 +36,15 @@ def add_blacklist(
     if not any([url, uuid, url_regex]):
         raise ValueError("At least one of url, uuid, or url_regex must be provided")
 
+    if url_regex:
+        try:
+            re.compile(url_regex)
+        except re.error as e:
+            raise ValueError(f"Invalid URL regex '{url_regex}': {e}") from e
+
     entry = {
         "reason": reason,
-        "blacklisted_at": now_iso8601(),
+        "blacklisted_at": now or now_iso8601(),
     }
 
     # Add identifiers
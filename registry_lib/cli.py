@@ -1,12 +1,25 @@
 """Command-line interface."""
 
 import argparse
+from collections import Counter
+from contextlib import redirect_stdout
+from functools import lru_cache
+import io
+from itertools import chain
 import json
+from operator import itemgetter
+import shlex
 import sys
 from typing import Any
 
 import tomli_w
 
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # ty: ignore[invalid-assignment,unused-ignore-comment]
+
 from registry_lib import colors
 from registry_lib.blacklist import add_blacklist
 from registry_lib.manifest import (
@@ -15,9 +28,11 @@ from registry_lib.manifest import (
 )
 from registry_lib.picard.constants import REGISTRY_TRUST_LEVELS
 from registry_lib.plugin import (
+    DEFAULT_MAX_WORKERS,
     DEFAULT_REF,
     add_plugin,
     update_plugin,
+    update_plugins,
 )
 from registry_lib.registry import Registry
 from registry_lib.utils import now_iso8601
@@ -32,36 +47,54 @@ def _format_trust(trust_level: str) -> str:
     return trust_level
 
 
-def _print_plugin_details(plugin: dict[str, Any], indent: str = "") -> None:
-    """Print detailed plugin information."""
-    print(f"{indent}{colors.dim('ID:')} {colors.cyan(plugin['id'])}")
-    print(f"{indent}{colors.dim('Name:')} {colors.bold(plugin['name'])}")
-    print(f"{indent}{colors.dim('UUID:')} {plugin['uuid']}")
-    print(f"{indent}{colors.dim('Description:')} {plugin['description']}")
-    print(f"{indent}{colors.dim('URL:')} {colors.blue(plugin['git_url'])}")
-    print(f"{indent}{colors.dim('Trust Level:')} {_format_trust(plugin['trust_level'])}")
-    print(f"{indent}{colors.dim('Categories:')} {', '.join(plugin.get('categories', []))}")
-    print(f"{indent}{colors.dim('Authors:')} {', '.join(plugin.get('authors', []))}")
+def _format_plugin_details(plugin: dict[str, Any], indent: str = "") -> str:
+    """Format detailed plugin information."""
+    lines = [
+        f"{indent}{colors.dim('ID:')} {colors.cyan(plugin['id'])}",
+        f"{indent}{colors.dim('Name:')} {colors.bold(plugin['name'])}",
+        f"{indent}{colors.dim('UUID:')} {plugin['uuid']}",
+        f"{indent}{colors.dim('Description:')} {plugin['description']}",
+        f"{indent}{colors.dim('URL:')} {colors.blue(plugin['git_url'])}",
+        f"{indent}{colors.dim('Trust Level:')} {_format_trust(plugin['trust_level'])}",
+        f"{indent}{colors.dim('Categories:')} {', '.join(plugin.get('categories', []))}",
+        f"{indent}{colors.dim('Authors:')} {', '.join(plugin.get('authors', []))}",
+    ]
     if 'maintainers' in plugin:
-        print(f"{indent}{colors.dim('Maintainers:')} {', '.join(plugin['maintainers'])}")
+        lines.append(f"{indent}{colors.dim('Maintainers:')} {', '.join(plugin['maintainers'])}")
     if 'report_bugs_to' in plugin:
-        print(f"{indent}{colors.dim('Report Bugs To:')} {colors.blue(plugin['report_bugs_to'])}")
+        lines.append(f"{indent}{colors.dim('Report Bugs To:')} {colors.blue(plugin['report_bugs_to'])}")
     if 'license' in plugin:
-        print(f"{indent}{colors.dim('License:')} {plugin['license']}")
+        lines.append(f"{indent}{colors.dim('License:')} {plugin['license']}")
     if 'license_url' in plugin:
-        print(f"{indent}{colors.dim('License URL:')} {colors.blue(plugin['license_url'])}")
+        lines.append(f"{indent}{colors.dim('License URL:')} {colors.blue(plugin['license_url'])}")
     if 'homepage' in plugin:
-        print(f"{indent}{colors.dim('Homepage:')} {colors.blue(plugin['homepage'])}")
+        lines.append(f"{indent}{colors.dim('Homepage:')} {colors.blue(plugin['homepage'])}")
     if 'long_description' in plugin:
-        print(f"{indent}{colors.dim('Long Description:')} ({len(plugin['long_description'])} chars)")
+        lines.append(f"{indent}{colors.dim('Long Description:')} ({len(plugin['long_description'])} chars)")
     for lang, text in sorted(plugin.get('long_description_i18n', {}).items()):
-        print(f"{indent}{colors.dim(f'Long Description[{lang}]:')} ({len(text)} chars)")
+        lines.append(f"{indent}{colors.dim(f'Long Description[{lang}]:')} ({len(text)} chars)")
     if 'versioning_scheme' in plugin:
-        print(f"{indent}{colors.dim('Versioning Scheme:')} {plugin['versioning_scheme']}")
+        lines.append(f"{indent}{colors.dim('Versioning Scheme:')} {plugin['versioning_scheme']}")
     if 'redirect_from' in plugin:
-        print(f"{indent}{colors.dim('Redirects from:')} {', '.join(plugin['redirect_from'])}")
-    print(f"{indent}{colors.dim('Added:')} {plugin['added_at']}")
-    print(f"{indent}{colors.dim('Updated:')} {plugin['updated_at']}")
+        lines.append(f"{indent}{colors.dim('Redirects from:')} {', '.join(plugin['redirect_from'])}")
+    lines.append(f"{indent}{colors.dim('Added:')} {plugin['added_at']}")
+    lines.append(f"{indent}{colors.dim('Updated:')} {plugin['updated_at']}")
+    return "\n".join(lines)
+
+
+def _dump_json(data: dict[str, Any]) -> str:
+    """Serialize data as indented JSON, using orjson if available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _open_registry(args: argparse.Namespace) -> Registry:
+    """Open the registry, or reuse the one of the batch being run."""
+    registry = getattr(args, "batch_registry", None)
+    if registry is None:
+        registry = Registry(args.registry)
+    return registry
 
 
 def get_plugin_or_exit(registry: Registry, plugin_id: str) -> dict[str, Any]:
@@ -83,23 +116,32 @@ def get_plugin_or_exit(registry: Registry, plugin_id: str) -> dict[str, Any]:
 
 def cmd_validate(args: argparse.Namespace) -> None:
     """Validate registry file."""
-    registry = Registry(args.registry)
+    registry = _open_registry(args)
+    plugins = registry.data['plugins']
     errors = []
 
-    # Check for duplicate IDs
-    ids = [p['id'] for p in registry.data['plugins']]
-    if len(ids) != len(set(ids)):
-        errors.append("Duplicate plugin IDs found")
+    # Check for duplicate IDs, UUIDs and git URLs in a single pass
+    seen_ids = set()
+    seen_uuids = set()
+    seen_urls = set()
+    for plugin in plugins:
+        plugin_id = plugin['id']
+        if plugin_id in seen_ids:
+            errors.append(f"Duplicate plugin ID: {plugin_id}")
+        else:
+            seen_ids.add(plugin_id)
 
-    # Check for duplicate UUIDs
-    uuids = [p['uuid'] for p in registry.data['plugins']]
-    if len(uuids) != len(set(uuids)):
-        errors.append("Duplicate plugin UUIDs found")
+        uuid = plugin['uuid']
+        if uuid in seen_uuids:
+            errors.append(f"Duplicate plugin UUID: {uuid} (plugin: {plugin_id})")
+        else:
+            seen_uuids.add(uuid)
 
-    # Check for duplicate git URLs
-    urls = [p['git_url'] for p in registry.data['plugins']]
-    if len(urls) != len(set(urls)):
-        errors.append("Duplicate git URLs found")
+        git_url = plugin['git_url']
+        if git_url in seen_urls:
+            errors.append(f"Duplicate git URL: {git_url} (plugin: {plugin_id})")
+        else:
+            seen_urls.add(git_url)
 
     if errors:
         for error in errors:
@@ -108,71 +150,66 @@ def cmd_validate(args: argparse.Namespace) -> None:
     else:
         print(
             colors.green(
-                f"✓ Registry valid: {len(registry.data['plugins'])} plugins, {len(registry.data['blacklist'])} blacklist entries"
+                f"✓ Registry valid: {len(plugins)} plugins, {len(registry.data['blacklist'])} blacklist entries"
             )
         )
 
 
 def cmd_stats(args: argparse.Namespace) -> None:
     """Show registry statistics."""
-    registry = Registry(args.registry)
+    registry = _open_registry(args)
     plugins = registry.data['plugins']
 
-    # Count by trust level
-    trust_counts = {}
-    for plugin in plugins:
-        trust = plugin.get('trust_level', 'unknown')
-        trust_counts[trust] = trust_counts.get(trust, 0) + 1
-
-    # Count by category
-    category_counts = {}
-    for plugin in plugins:
-        for cat in plugin.get('categories', []):
-            category_counts[cat] = category_counts.get(cat, 0) + 1
+    trust_counts = Counter(plugin.get('trust_level', 'unknown') for plugin in plugins)
+    category_counts = Counter(chain.from_iterable(plugin.get('categories', ()) for plugin in plugins))
 
-    print(f"Total plugins: {colors.bold(str(len(plugins)))}")
-    print(f"Blacklist entries: {colors.bold(str(len(registry.data['blacklist'])))}")
-    print()
-    print(colors.bold("By trust level:"))
-    for trust, count in sorted(trust_counts.items()):
-        print(f"  {_format_trust(trust)}: {count}")
-    print()
-    print(colors.bold("By category:"))
-    for cat, count in sorted(category_counts.items()):
-        print(f"  {cat}: {count}")
+    lines = [
+        f"Total plugins: {colors.bold(str(len(plugins)))}",
+        f"Blacklist entries: {colors.bold(str(len(registry.data['blacklist'])))}",
+        "",
+        colors.bold("By trust level:"),
+    ]
+    lines.extend(f"  {_format_trust(trust)}: {count}" for trust, count in sorted(trust_counts.items()))
+    lines.append("")
+    lines.append(colors.bold("By category:"))
+    lines.extend(f"  {cat}: {count}" for cat, count in sorted(category_counts.items()))
+    print("\n".join(lines))
 
 
 def cmd_output(args: argparse.Namespace) -> None:
     """Output registry in specified format."""
-    registry = Registry(args.registry)
+    registry = _open_registry(args)
 
     if args.format == "json":
-        print(json.dumps(registry.data, indent=2, ensure_ascii=False))
+        print(_dump_json(registry.data))
     elif args.format == "toml":
         print(tomli_w.dumps(registry.data, multiline_strings=True, indent=2))
     elif args.format == "human":
         plugins = registry.data['plugins']
         blacklist = registry.data['blacklist']
 
-        print(
-            f"Registry: {colors.bold(str(len(plugins)))} plugins, {colors.bold(str(len(blacklist)))} blacklist entries\n"
-        )
-        print("=" * 80)
+        # Collect all lines and print them at once
+        lines = [
+            f"Registry: {colors.bold(str(len(plugins)))} plugins, {colors.bold(str(len(blacklist)))} blacklist entries\n",
+            "=" * 80,
+        ]
 
         for plugin in plugins:
-            print()
-            _print_plugin_details(plugin, indent="  ")
+            lines.append("")
+            lines.append(_format_plugin_details(plugin, indent="  "))
 
         if blacklist:
-            print("\n" + "=" * 80)
-            print(f"\n{colors.bold(f'Blacklist ({len(blacklist)} entries):')}\n")
+            lines.append("\n" + "=" * 80)
+            lines.append(f"\n{colors.bold(f'Blacklist ({len(blacklist)} entries):')}\n")
             for entry in blacklist:
-                print(f"• {colors.red(entry.get('git_url', entry.get('uuid', 'Unknown')))}")
+                lines.append(f"• {colors.red(entry.get('git_url', entry.get('uuid', 'Unknown')))}")
                 if entry.get('reason'):
-                    print(f"  {colors.dim('Reason:')} {entry['reason']}")
+                    lines.append(f"  {colors.dim('Reason:')} {entry['reason']}")
                 if entry.get('date'):
-                    print(f"  {colors.dim('Date:')} {entry['date']}")
-                print()
+                    lines.append(f"  {colors.dim('Date:')} {entry['date']}")
+                lines.append("")
+
+        print("\n".join(lines))
     else:
         print(f"Error: Unknown format '{args.format}'", file=sys.stderr)
         sys.exit(1)
@@ -186,7 +223,7 @@ def cmd_display(args: argparse.Namespace) -> None:
 
 def cmd_plugin_redirect(args: argparse.Namespace) -> None:
     """Add, remove, or list redirects for plugin that moved URLs."""
-    registry = Registry(args.registry)
+    registry = _open_registry(args)
     plugin = get_plugin_or_exit(registry, args.plugin_id)
 
     if args.list:
@@ -195,37 +232,35 @@ def cmd_plugin_redirect(args: argparse.Namespace) -> None:
         if not redirects:
             print("No redirects defined")
         else:
-            for url in redirects:
-                print(f"{url} -> {plugin['git_url']}")
+            print("\n".join(f"{url} -> {plugin['git_url']}" for url in redirects))
     elif args.remove:
-        # Remove URL from redirect_from
-        if 'redirect_from' in plugin and args.old_url in plugin['redirect_from']:
-            plugin['redirect_from'].remove(args.old_url)
-            if not plugin['redirect_from']:
-                del plugin['redirect_from']
-            plugin["updated_at"] = now_iso8601()
-            registry.save()
-            print(colors.green(f"Removed redirect: {args.old_url}"))
-        else:
+        # Remove URL from redirect_from, looking it up only once
+        redirects = plugin.get('redirect_from', [])
+        try:
+            redirects.remove(args.old_url)
+        except ValueError:
             print(f"Error: Redirect {args.old_url} not found", file=sys.stderr)
             sys.exit(1)
-    else:
-        # Initialize redirect_from if not present
-        if 'redirect_from' not in plugin:
-            plugin['redirect_from'] = []
-
-        # Add old URL to redirect_from
-        if args.old_url not in plugin['redirect_from']:
-            plugin['redirect_from'].append(args.old_url)
-
-        plugin["updated_at"] = now_iso8601()
+        if not redirects:
+            del plugin['redirect_from']
+        plugin["updated_at"] = args.now
+        registry.mark_changed()
         registry.save()
+        print(colors.green(f"Removed redirect: {args.old_url}"))
+    else:
+        # Add old URL to redirect_from, nothing to save if it is already there
+        redirects = plugin.setdefault('redirect_from', [])
+        if args.old_url not in redirects:
+            redirects.append(args.old_url)
+            plugin["updated_at"] = args.now
+            registry.mark_changed()
+            registry.save()
         print(colors.green(f"Added redirect: {args.old_url} -> {plugin['git_url']}"))
 
 
 def cmd_plugin_ref_add(args: argparse.Namespace) -> None:
     """Add ref to plugin."""
-    registry = Registry(args.registry)
+    registry = _open_registry(args)
     plugin = get_plugin_or_exit(registry, args.plugin_id)
 
     # Initialize refs if not present
@@ -233,10 +268,9 @@ def cmd_plugin_ref_add(args: argparse.Namespace) -> None:
         plugin['refs'] = []
 
     # Check if ref already exists
-    for ref in plugin['refs']:
-        if ref['name'] == args.ref_name:
-            print(f"Error: Ref {args.ref_name} already exists", file=sys.stderr)
-            sys.exit(1)
+    if args.ref_name in {r['name'] for r in plugin['refs']}:
+        print(f"Error: Ref {args.ref_name} already exists", file=sys.stderr)
+        sys.exit(1)
 
     # Build ref entry
     ref = {"name": args.ref_name}
@@ -248,33 +282,31 @@ def cmd_plugin_ref_add(args: argparse.Namespace) -> None:
         ref["max_api_version"] = args.max_api_version
 
     plugin['refs'].append(ref)
-    plugin["updated_at"] = now_iso8601()
+    plugin["updated_at"] = args.now
+    registry.mark_changed()
     registry.save()
     print(colors.green(f"Added ref: {args.ref_name}"))
 
 
 def cmd_plugin_ref_edit(args: argparse.Namespace) -> None:
     """Edit ref in plugin."""
-    registry = Registry(args.registry)
+    registry = _open_registry(args)
     plugin = get_plugin_or_exit(registry, args.plugin_id)
 
-    # Find ref
-    ref = None
-    for r in plugin.get('refs', []):
-        if r['name'] == args.ref_name:
-            ref = r
-            break
+    # Index refs by name (first ref wins on duplicate names)
+    refs_by_name = {r['name']: r for r in reversed(plugin.get('refs', []))}
 
+    # Find ref
+    ref = refs_by_name.get(args.ref_name)
     if not ref:
         print(f"Error: Ref {args.ref_name} not found", file=sys.stderr)
         sys.exit(1)
 
     # Check if new name conflicts
     if args.new_name and args.new_name != args.ref_name:
-        for r in plugin.get('refs', []):
-            if r['name'] == args.new_name:
-                print(f"Error: Ref {args.new_name} already exists", file=sys.stderr)
-                sys.exit(1)
+        if args.new_name in refs_by_name:
+            print(f"Error: Ref {args.new_name} already exists", file=sys.stderr)
+            sys.exit(1)
         ref["name"] = args.new_name
 
     # Update fields
@@ -288,14 +320,15 @@ def cmd_plugin_ref_edit(args: argparse.Namespace) -> None:
     if args.max_api_version:
         ref["max_api_version"] = args.max_api_version
 
-    plugin["updated_at"] = now_iso8601()
+    plugin["updated_at"] = args.now
+    registry.mark_changed()
     registry.save()
     print(colors.green(f"Updated ref: {args.new_name if args.new_name else args.ref_name}"))
 
 
 def cmd_plugin_ref_remove(args: argparse.Namespace) -> None:
     """Remove ref from plugin."""
-    registry = Registry(args.registry)
+    registry = _open_registry(args)
     plugin = get_plugin_or_exit(registry, args.plugin_id)
 
     if 'refs' not in plugin:
@@ -303,25 +336,26 @@ def cmd_plugin_ref_remove(args: argparse.Namespace) -> None:
         sys.exit(1)
 
     # Remove ref
-    original_len = len(plugin['refs'])
-    plugin['refs'] = [r for r in plugin['refs'] if r['name'] != args.ref_name]
-
-    if len(plugin['refs']) == original_len:
+    refs = [r for r in plugin['refs'] if r['name'] != args.ref_name]
+    if len(refs) == len(plugin['refs']):
         print(f"Error: Ref {args.ref_name} not found", file=sys.stderr)
         sys.exit(1)
 
     # Remove refs field if empty
-    if not plugin['refs']:
+    if refs:
+        plugin['refs'] = refs
+    else:
         del plugin['refs']
 
-    plugin["updated_at"] = now_iso8601()
+    plugin["updated_at"] = args.now
+    registry.mark_changed()
     registry.save()
     print(colors.green(f"Removed ref: {args.ref_name}"))
 
 
 def cmd_plugin_ref_list(args: argparse.Namespace) -> None:
     """List refs for plugin."""
-    registry = Registry(args.registry)
+    registry = _open_registry(args)
     plugin = get_plugin_or_exit(registry, args.plugin_id)
 
     refs = plugin.get('refs', [])
@@ -347,7 +381,7 @@ def cmd_plugin_ref_list(args: argparse.Namespace) -> None:
 
 def cmd_plugin_edit(args: argparse.Namespace) -> None:
     """Edit plugin in registry."""
-    registry = Registry(args.registry)
+    registry = _open_registry(args)
     plugin = get_plugin_or_exit(registry, args.plugin_id)
 
     # Update fields if provided
@@ -363,7 +397,8 @@ def cmd_plugin_edit(args: argparse.Namespace) -> None:
         elif "versioning_scheme" in plugin:
             del plugin["versioning_scheme"]
 
-    plugin["updated_at"] = now_iso8601()
+    plugin["updated_at"] = args.now
+    registry.mark_changed()
     registry.save()
     print(colors.green(f"Updated plugin: {plugin['name']} ({plugin['id']})"))
 
@@ -377,10 +412,16 @@ def cmd_plugin_validate_manifest(args: argparse.Namespace) -> None:
 
 def cmd_plugin_add(args: argparse.Namespace) -> None:
     """Add plugin to registry."""
-    registry = Registry(args.registry)
+    registry = _open_registry(args)
     categories = args.categories.split(',') if args.categories else None
     plugin = add_plugin(
-        registry, args.url, args.trust, categories=categories, refs=args.refs, versioning_scheme=args.versioning_scheme
+        registry,
+        args.url,
+        args.trust,
+        categories=categories,
+        refs=args.refs,
+        versioning_scheme=args.versioning_scheme,
+        now=args.now,
     )
     registry.save()
     print(colors.green(f"Added plugin: {plugin['name']} ({plugin['id']})"))
@@ -388,15 +429,31 @@ def cmd_plugin_add(args: argparse.Namespace) -> None:
 
 def cmd_plugin_update(args: argparse.Namespace) -> None:
     """Update plugin metadata from MANIFEST."""
-    registry = Registry(args.registry)
-    plugin = update_plugin(registry, args.plugin_id, ref=args.ref)
+    registry = _open_registry(args)
+    plugin = update_plugin(registry, args.plugin_id, ref=args.ref, now=args.now)
     registry.save()
     print(colors.green(f"Updated plugin: {plugin['name']} ({plugin['id']})"))
 
 
+def cmd_plugin_update_all(args: argparse.Namespace) -> int:
+    """Update metadata of all or the given plugins from their MANIFEST.
+
+    Plugins that could be updated are saved even if others fail, the
+    failures are reported with a non-zero exit status.
+    """
+    registry = _open_registry(args)
+    updated, errors = update_plugins(registry, args.plugin_ids or None, max_workers=args.jobs, now=args.now)
+    registry.save()
+    for plugin in updated:
+        print(colors.green(f"Updated plugin: {plugin['name']} ({plugin['id']})"))
+    for plugin_id, error in errors.items():
+        print(colors.red(f"Error: {plugin_id}: {error}"), file=sys.stderr)
+    return 1 if errors else 0
+
+
 def cmd_plugin_remove(args: argparse.Namespace) -> None:
     """Remove plugin from registry."""
-    registry = Registry(args.registry)
+    registry = _open_registry(args)
     registry.remove_plugin(args.plugin_id)
     registry.save()
     print(colors.green(f"Removed plugin: {args.plugin_id}"))
@@ -404,40 +461,46 @@ def cmd_plugin_remove(args: argparse.Namespace) -> None:
 
 def cmd_plugin_list(args: argparse.Namespace) -> None:
     """List plugins in registry."""
-    registry = Registry(args.registry)
-    plugins = registry.data["plugins"]
-
-    # Filter by trust level
-    if args.trust:
-        plugins = [p for p in plugins if p.get("trust_level") == args.trust]
+    registry = _open_registry(args)
+    trust = args.trust
+    category = args.category
 
-    # Filter by category
-    if args.category:
-        plugins = [p for p in plugins if args.category in p.get("categories", [])]
+    # Filter by trust level and category in a single pass
+    plugins = [
+        p
+        for p in registry.data["plugins"]
+        if (not trust or p.get("trust_level") == trust) and (not category or category in p.get("categories", ()))
+    ]
 
     # Sort by ID
-    plugins = sorted(plugins, key=lambda p: p["id"])
+    plugins.sort(key=itemgetter("id"))
 
-    for i, plugin in enumerate(plugins):
-        if args.verbose:
-            if i > 0:
-                print()  # Blank line between plugins
-            _print_plugin_details(plugin)
-        else:
-            print(f"{colors.cyan(plugin['id'])}: {plugin['name']} ({_format_trust(plugin['trust_level'])})")
+    if not plugins:
+        return
+
+    if args.verbose:
+        # Blank line between plugins
+        print("\n\n".join(_format_plugin_details(plugin) for plugin in plugins))
+    else:
+        print(
+            "\n".join(
+                f"{colors.cyan(plugin['id'])}: {plugin['name']} ({_format_trust(plugin['trust_level'])})"
+                for plugin in plugins
+            )
+        )
 
 
 def cmd_plugin_show(args: argparse.Namespace) -> None:
     """Show plugin details."""
-    registry = Registry(args.registry)
+    registry = _open_registry(args)
     plugin = get_plugin_or_exit(registry, args.plugin_id)
-    _print_plugin_details(plugin)
+    print(_format_plugin_details(plugin))
 
 
 def cmd_blacklist_add(args: argparse.Namespace) -> None:
     """Add entry to blacklist."""
-    registry = Registry(args.registry)
-    add_blacklist(registry, url=args.url, uuid=args.uuid, url_regex=args.url_regex, reason=args.reason)
+    registry = _open_registry(args)
+    add_blacklist(registry, url=args.url, uuid=args.uuid, url_regex=args.url_regex, reason=args.reason, now=args.now)
     registry.save()
     identifier = args.uuid or args.url or args.url_regex
     print(colors.green(f"Blacklisted: {identifier}"))
@@ -445,38 +508,40 @@ def cmd_blacklist_add(args: argparse.Namespace) -> None:
 
 def cmd_blacklist_remove(args: argparse.Namespace) -> None:
     """Remove entry from blacklist."""
-    registry = Registry(args.registry)
+    registry = _open_registry(args)
     registry.remove_blacklist(url=args.url, uuid=args.uuid)
     registry.save()
     identifier = args.uuid or args.url
     print(colors.green(f"Removed from blacklist: {identifier}"))
 
 
+# Blacklist entry keys shown by "blacklist list": key, label, value formatter
+_BLACKLIST_IDENTIFIERS = (
+    ("uuid", "UUID", str),
+    ("url", "URL", colors.blue),
+    ("url_regex", "REGEX", str),
+)
+
+
+def _format_blacklist_identifiers(entry: dict[str, str]) -> str:
+    """Format the identifiers of a blacklist entry."""
+    return ", ".join(
+        f"{label}:{format_value(entry[key])}" for key, label, format_value in _BLACKLIST_IDENTIFIERS if key in entry
+    )
+
+
 def cmd_blacklist_list(args: argparse.Namespace) -> None:
     """List blacklisted entries."""
-    registry = Registry(args.registry)
-    for entry in registry.data["blacklist"]:
-        identifiers = []
-        if "uuid" in entry:
-            identifiers.append(f"UUID:{entry['uuid']}")
-        if "url" in entry:
-            identifiers.append(f"URL:{colors.blue(entry['url'])}")
-        if "url_regex" in entry:
-            identifiers.append(f"REGEX:{entry['url_regex']}")
-        identifier_str = ", ".join(identifiers)
-        print(f"{identifier_str}: {entry['reason']}")
+    registry = _open_registry(args)
+    lines = [f"{_format_blacklist_identifiers(entry)}: {entry['reason']}" for entry in registry.data["blacklist"]]
+    if lines:
+        print("\n".join(lines))
 
 
 def cmd_blacklist_show(args: argparse.Namespace) -> None:
     """Show blacklist entry details."""
-    registry = Registry(args.registry)
-
-    # Find entry by URL or UUID
-    entry = None
-    for e in registry.data["blacklist"]:
-        if (args.url and e.get("url") == args.url) or (args.uuid and e.get("uuid") == args.uuid):
-            entry = e
-            break
+    registry = _open_registry(args)
+    entry = registry.find_blacklist(url=args.url, uuid=args.uuid)
 
     if not entry:
         identifier = args.uuid or args.url
@@ -484,33 +549,62 @@ def cmd_blacklist_show(args: argparse.Namespace) -> None:
         sys.exit(1)
 
     # Display entry details
+    lines = []
     if "uuid" in entry:
-        print(f"{colors.dim('UUID:')} {entry['uuid']}")
+        lines.append(f"{colors.dim('UUID:')} {entry['uuid']}")
     if "url" in entry:
-        print(f"{colors.dim('URL:')} {colors.blue(entry['url'])}")
+        lines.append(f"{colors.dim('URL:')} {colors.blue(entry['url'])}")
     if "url_regex" in entry:
-        print(f"{colors.dim('URL Regex:')} {entry['url_regex']}")
-    print(f"{colors.dim('Reason:')} {entry['reason']}")
-    print(f"{colors.dim('Blacklisted at:')} {entry['blacklisted_at']}")
+        lines.append(f"{colors.dim('URL Regex:')} {entry['url_regex']}")
+    lines.append(f"{colors.dim('Reason:')} {entry['reason']}")
+    lines.append(f"{colors.dim('Blacklisted at:')} {entry['blacklisted_at']}")
+    print("\n".join(lines))
 
 
-def main() -> None:
-    """Main CLI entry point."""
-    # Ensure utf-8 is used for IO encoding on all platforms. Specifically on Windows
-    # this fixes encoding issues during console output in certain cases.
-    sys.stdout.reconfigure(encoding="utf-8")  # ty: ignore[unresolved-attribute]
-    sys.stderr.reconfigure(encoding="utf-8")  # ty: ignore[unresolved-attribute]
+def cmd_batch(args: argparse.Namespace) -> int:
+    """Run commands from a file, saving the registry once at the end.
 
-    parser = argparse.ArgumentParser(description="Picard plugins registry maintenance tool")
-    parser.add_argument("--registry", default="plugins.toml", help="Path to registry file")
-    parser.add_argument("--no-color", action="store_true", help="Disable colored output")
-
-    subparsers = parser.add_subparsers(dest="command", required=True)
-
-    # Plugin commands
-    plugin_parser = subparsers.add_parser("plugin", help="Plugin operations")
-    plugin_subparsers = plugin_parser.add_subparsers(dest="plugin_command", required=True)
+    The output of the commands is only printed once the registry is saved,
+    so nothing is reported as done if a later command aborts the batch.
+    """
+    with open(args.file, encoding="utf-8") as f:
+        lines = f.read().splitlines()
 
+    registry = Registry(args.registry)
+    output = io.StringIO()
+    status = 0
+    with registry.transaction(), redirect_stdout(output):
+        for number, line in enumerate(lines, 1):
+            try:
+                status = _run_batch_line(line, args, registry) or status
+            except SystemExit:
+                # The command has already reported its error
+                print(colors.red(f"Error: batch aborted at line {number}, nothing was saved"), file=sys.stderr)
+                raise
+            except Exception as e:
+                raise ValueError(f"line {number}: {e} (batch aborted, nothing was saved)") from e
+    print(output.getvalue(), end="")
+    return status
+
+
+def _run_batch_line(line: str, args: argparse.Namespace, registry: Registry) -> int | None:
+    """Run one command of a batch file on the registry of the batch."""
+    argv = shlex.split(line, comments=True)
+    if not argv:
+        return None
+    if argv[0].startswith("-"):
+        raise ValueError(f"global option {argv[0]} can not be used in a batch file")
+    command = _find_command(argv)
+    if command == "batch":
+        raise ValueError("batch commands can not be nested")
+    batch_args = _build_parser(command).parse_args(argv)
+    batch_args.now = args.now
+    batch_args.batch_registry = registry
+    return batch_args.func(batch_args)
+
+
+def _add_plugin_commands(plugin_subparsers: "argparse._SubParsersAction[argparse.ArgumentParser]") -> None:
+    """Add the plugin subcommands to the parser."""
     # plugin add
     add_parser = plugin_subparsers.add_parser("add", help="Add plugin")
     add_parser.add_argument("url", help="Git repository URL")
@@ -538,6 +632,22 @@ def main() -> None:
     update_parser.add_argument("--ref", help="Git ref to fetch MANIFEST from (default: first ref or main)")
     update_parser.set_defaults(func=cmd_plugin_update)
 
+    # plugin update-all
+    update_all_parser = plugin_subparsers.add_parser(
+        "update-all", help="Update metadata of all plugins from MANIFEST (default refs)"
+    )
+    update_all_parser.add_argument(
+        "plugin_ids", nargs="*", metavar="plugin_id", help="Plugin IDs to update (default: all plugins)"
+    )
+    update_all_parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help=f"Number of MANIFESTs fetched concurrently (default: {DEFAULT_MAX_WORKERS})",
+    )
+    update_all_parser.set_defaults(func=cmd_plugin_update_all)
+
     # plugin edit
     edit_parser = plugin_subparsers.add_parser("edit", help="Edit plugin")
     edit_parser.add_argument("plugin_id", help="Plugin ID")
@@ -582,10 +692,9 @@ def main() -> None:
     vm_parser.add_argument("--ref", default="main", help="Git ref (default: main)")
     vm_parser.set_defaults(func=cmd_plugin_validate_manifest)
 
-    # Ref commands
-    ref_parser = subparsers.add_parser("ref", help="Plugin ref operations")
-    ref_subparsers = ref_parser.add_subparsers(dest="ref_command", required=True)
 
+def _add_ref_commands(ref_subparsers: "argparse._SubParsersAction[argparse.ArgumentParser]") -> None:
+    """Add the ref subcommands to the parser."""
     ref_add_parser = ref_subparsers.add_parser("add", help="Add ref to plugin")
     ref_add_parser.add_argument("plugin_id", help="Plugin ID")
     ref_add_parser.add_argument("ref_name", help="Ref name (e.g., main, develop)")
@@ -612,10 +721,9 @@ def main() -> None:
     ref_list_parser.add_argument("plugin_id", help="Plugin ID")
     ref_list_parser.set_defaults(func=cmd_plugin_ref_list)
 
-    # Blacklist commands
-    blacklist_parser = subparsers.add_parser("blacklist", help="Blacklist operations")
-    blacklist_subparsers = blacklist_parser.add_subparsers(dest="blacklist_command", required=True)
 
+def _add_blacklist_commands(blacklist_subparsers: "argparse._SubParsersAction[argparse.ArgumentParser]") -> None:
+    """Add the blacklist subcommands to the parser."""
     # blacklist add
     bl_add_parser = blacklist_subparsers.add_parser("add", help="Add to blacklist")
     bl_add_parser.add_argument("--url", help="Git URL to blacklist")
@@ -640,6 +748,59 @@ def main() -> None:
     bl_show_parser.add_argument("--uuid", help="Plugin UUID")
     bl_show_parser.set_defaults(func=cmd_blacklist_show)
 
+
+# Commands with nested subcommands: name -> (help, dest for the subcommand, function adding the subcommands)
+_COMMAND_GROUPS = {
+    "plugin": ("Plugin operations", "plugin_command", _add_plugin_commands),
+    "ref": ("Plugin ref operations", "ref_command", _add_ref_commands),
+    "blacklist": ("Blacklist operations", "blacklist_command", _add_blacklist_commands),
+}
+
+
+def _find_command(argv: list[str]) -> str | None:
+    """Find the top-level command in the command line arguments.
+
+    Args:
+        argv: Command line arguments, without the program name
+
+    Returns:
+        First positional argument, or None if there is none
+    """
+    args = iter(argv)
+    for arg in args:
+        if not arg.startswith("-"):
+            return arg
+        # argparse accepts unambiguous prefixes of long options
+        if len(arg) > 2 and "--registry".startswith(arg):
+            next(args, None)
+    return None
+
+
+@lru_cache(maxsize=16)
+def _build_parser(command: str | None = None) -> argparse.ArgumentParser:
+    """Build the command line parser.
+
+    Nested subcommands are only added for the given command, building them
+    all takes a noticeable part of the startup time. Parsers are cached, so
+    batch files and repeated calls to main() build each one only once.
+
+    Args:
+        command: Top-level command being run, subcommands of all commands are added if None or unknown
+
+    Returns:
+        Argument parser
+    """
+    parser = argparse.ArgumentParser(description="Picard plugins registry maintenance tool")
+    parser.add_argument("--registry", default="plugins.toml", help="Path to registry file")
+    parser.add_argument("--no-color", action="store_true", help="Disable colored output")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # Plugin, ref and blacklist commands, their subcommands are added below
+    group_parsers = {
+        name: subparsers.add_parser(name, help=help_text) for name, (help_text, _, _) in _COMMAND_GROUPS.items()
+    }
+
     # Validate command
     validate_parser = subparsers.add_parser("validate", help="Validate registry")
     validate_parser.set_defaults(func=cmd_validate)
@@ -659,13 +820,41 @@ def main() -> None:
     display_parser = subparsers.add_parser("display", help="Display registry in human-readable format")
     display_parser.set_defaults(func=cmd_display)
 
+    # Batch command
+    batch_parser = subparsers.add_parser("batch", help="Run commands from a file and save the registry once")
+    batch_parser.add_argument(
+        "file", help="File with one command per line, e.g. 'plugin edit my-plugin --trust trusted'"
+    )
+    batch_parser.set_defaults(func=cmd_batch)
+
+    # Without a known command, add everything so argparse can report errors
+    add_all = command not in subparsers.choices
+    for name, (_, dest, add_commands) in _COMMAND_GROUPS.items():
+        if add_all or name == command:
+            add_commands(group_parsers[name].add_subparsers(dest=dest, required=True))
+
+    return parser
+
+
+def main() -> None:
+    """Main CLI entry point."""
+    # Ensure utf-8 is used for IO encoding on all platforms. Specifically on Windows
+    # this fixes encoding issues during console output in certain cases.
+    sys.stdout.reconfigure(encoding="utf-8")  # ty: ignore[unresolved-attribute]
+    sys.stderr.reconfigure(encoding="utf-8")  # ty: ignore[unresolved-attribute]
+
+    parser = _build_parser(_find_command(sys.argv[1:]))
     args = parser.parse_args()
+    # Use one timestamp for all changes made by this invocation
+    args.now = now_iso8601()
     colors.init(no_color=args.no_color)
     try:
-        args.func(args)
+        status = args.func(args)
     except Exception as e:
         print(colors.red(f"Error: {e}"), file=sys.stderr)
         sys.exit(1)
+    if status:
+        sys.exit(status)
 
 
 if __name__ == "__main__":
@@ -1,10 +1,14 @@
 """MANIFEST.toml fetching and validation."""
 
+from collections import OrderedDict
+from functools import lru_cache
+import hashlib
 import os
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 
 import requests
@@ -33,6 +37,10 @@ class GitOperationError(Exception):
     """Raised when a git operation (clone, fetch) fails."""
 
 
+class ManifestValidationError(ValueError):
+    """Raised when a MANIFEST.toml fails validation."""
+
+
 GIT_SOURCES = {
     "github.com": lambda url, ref, path: url.replace("github.com", "raw.githubusercontent.com") + f"/{ref}/{path}",
     "gitlab.com": lambda url, ref, path: f"{url}/-/raw/{ref}/{path}",
@@ -173,6 +181,37 @@ def _fetch_local_manifest(source: str) -> dict[str, Any]:
         return tomllib.load(f)
 
 
+# Maximum number of fetched and of validated manifests kept in memory
+_MANIFEST_CACHE_SIZE = 256
+
+# One session per thread, so repeated fetches from the same host reuse
+# connections without sharing a session between concurrent fetches
+_thread_local = threading.local()
+
+
+def _session() -> requests.Session:
+    """Return the HTTP session of the current thread, creating it on first use."""
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = _thread_local.session = requests.Session()
+    return session
+
+
+@lru_cache(maxsize=_MANIFEST_CACHE_SIZE)
+def _fetch_manifest_text(git_url: str, ref: str) -> str:
+    """Fetch the MANIFEST.toml content from a git repository.
+
+    Results are cached per process, so repeated fetches of the same
+    repository and ref only hit the network once.
+    """
+    url = raw_url(git_url, ref, "MANIFEST.toml")
+    if url:
+        response = _session().get(url, timeout=10)
+        response.raise_for_status()
+        return response.text
+    return fetch_file_via_clone(git_url, ref, "MANIFEST.toml")
+
+
 def fetch_manifest(git_url: str, ref: str = "main", *, allow_local: bool = False) -> dict[str, Any]:
     """Fetch MANIFEST.toml from git repository or local path.
 
@@ -197,15 +236,13 @@ def fetch_manifest(git_url: str, ref: str = "main", *, allow_local: bool = False
             raise ValueError(f"Local paths are not accepted: {git_url}")
         return _fetch_local_manifest(git_url)
 
-    url = raw_url(git_url, ref, "MANIFEST.toml")
-    if url:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        content = response.text
-    else:
-        content = fetch_file_via_clone(git_url, ref, "MANIFEST.toml")
+    return tomllib.loads(_fetch_manifest_text(git_url, ref))
+
 
-    return tomllib.loads(content)
+# Digests of manifests that passed validation, least recently used first.
+# Validating renders the long description as markdown, so checking the same
+# content again is skipped.
+_valid_manifests: OrderedDict[bytes, None] = OrderedDict()
 
 
 def validate_manifest(manifest: dict[str, Any]) -> None:
@@ -215,8 +252,16 @@ def validate_manifest(manifest: dict[str, Any]) -> None:
         manifest: Parsed MANIFEST.toml dict
 
     Raises:
-        ValueError: If manifest is invalid
+        ManifestValidationError: If manifest is invalid
     """
+    # The repr of parsed TOML data tells apart all values and their types
+    digest = hashlib.blake2b(repr(manifest).encode(), digest_size=16).digest()
+    if digest in _valid_manifests:
+        _valid_manifests.move_to_end(digest)
+        return
     errors = validate_manifest_dict(manifest)
     if errors:
-        raise ValueError(f"Manifest validation failed: {', '.join(errors)}")
+        raise ManifestValidationError(f"Manifest validation failed: {', '.join(errors)}")
+    _valid_manifests[digest] = None
+    if len(_valid_manifests) > _MANIFEST_CACHE_SIZE:
+        _valid_manifests.popitem(last=False)
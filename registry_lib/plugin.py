@@ -1,5 +1,6 @@
 """Plugin operations."""
 
+from concurrent.futures import ThreadPoolExecutor
 import re
 from typing import Any
 import warnings
@@ -17,6 +18,33 @@ from registry_lib.utils import (
 
 
 DEFAULT_REF = "main"
+# Default number of manifests fetched concurrently by update_plugins()
+DEFAULT_MAX_WORKERS = 8
+
+
+class InvalidTrustLevelError(ValueError):
+    """Raised when a trust level is not one of the registry trust levels."""
+
+
+class DuplicatePluginError(ValueError):
+    """Raised when adding a plugin that is already in the registry."""
+
+
+class DuplicateURLError(DuplicatePluginError):
+    """Raised when a plugin with the same git URL already exists."""
+
+
+class DuplicateUUIDError(DuplicatePluginError):
+    """Raised when a plugin with the same UUID already exists."""
+
+
+class DuplicateIDError(DuplicatePluginError):
+    """Raised when a plugin with the same ID already exists."""
+
+
+class UUIDMismatchError(ValueError):
+    """Raised when a MANIFEST UUID differs from the UUID in the registry."""
+
 
 _OPTIONAL_MANIFEST_FIELDS = (
     "description_i18n",
@@ -33,31 +61,39 @@ _OPTIONAL_MANIFEST_FIELDS = (
 WHITESPACE_WARNING_RE = re.compile(r'^\n?(\S.*\S)*\S?\n?$', re.DOTALL)
 
 
-def _strip_field(value: Any, field_name: str, plugin_id: str) -> Any:
-    """Strip whitespace from a string value, warning if it differs."""
+def _strip_field(value: Any, field_name: str, plugin_id: str, stacklevel: int = 2) -> Any:
+    """Strip whitespace from a string value, warning if it differs.
+
+    The stacklevel of the warning is relative to this function, as for
+    warnings.warn(). Helpers pass it down so the warning points at the
+    caller of the public function.
+    """
     if isinstance(value, str):
         # Allow single leading/trailing newline to accommodate docstring type entries
         if not WHITESPACE_WARNING_RE.fullmatch(value):
             warnings.warn(
                 f"Plugin '{plugin_id}': field '{field_name}' has leading/trailing whitespace",
-                stacklevel=2,
+                stacklevel=stacklevel,
             )
         return value.strip()
     return value
 
 
-def _sync_optional_fields(plugin: dict[str, Any], manifest: dict[str, Any], fields: tuple[str, ...]) -> None:
+def _sync_optional_fields(
+    plugin: dict[str, Any], manifest: dict[str, Any], fields: tuple[str, ...], stacklevel: int = 2
+) -> None:
     """Sync optional fields from manifest to plugin.
 
     Args:
         plugin: Plugin dict to update
         manifest: Manifest dict to read from
         fields: List of field names to sync
+        stacklevel: Stack level of whitespace warnings, relative to this function
     """
     plugin_id = plugin["id"]
     for field in fields:
         if field in manifest:
-            plugin[field] = _strip_field(manifest[field], field, plugin_id)
+            plugin[field] = _strip_field(manifest[field], field, plugin_id, stacklevel + 1)
         elif field in plugin:
             del plugin[field]
 
@@ -69,6 +105,7 @@ def add_plugin(
     categories: list[str] | None = None,
     refs: str | None = None,
     versioning_scheme: str | None = None,
+    now: str | None = None,
 ) -> dict[str, Any]:
     """Add plugin to registry.
 
@@ -80,15 +117,19 @@ def add_plugin(
         refs: Comma-separated refs with optional API versions (e.g., "main:4.0,picard-v3:3.0-3.99")
               or None for default "main"
         versioning_scheme: Version tagging scheme (semver, calver, or regex:<pattern>)
+        now: Timestamp to use for added_at and updated_at (optional, defaults to current time)
 
     Returns:
         dict: Added plugin entry
 
     Raises:
-        ValueError: If validation fails or plugin exists
+        InvalidTrustLevelError: If trust level is invalid
+        ManifestValidationError: If manifest validation fails
+        DuplicatePluginError: If plugin exists
+        ValueError: If no plugin ID can be derived from the URL
     """
     if trust_level not in REGISTRY_TRUST_LEVELS:
-        raise ValueError(f"Invalid trust level: {trust_level}")
+        raise InvalidTrustLevelError(f"Invalid trust level: {trust_level}")
 
     # Parse refs
     if refs:
@@ -103,24 +144,23 @@ def add_plugin(
     # Derive plugin ID
     plugin_id = derive_plugin_id(git_url)
 
-    # Check for duplicates in single pass
-    for existing in registry.data["plugins"]:
-        if existing["git_url"] == git_url:
-            raise ValueError(f"Plugin with git URL '{git_url}' already exists (plugin: {existing['id']})")
-        if existing["uuid"] == manifest["uuid"]:
-            raise ValueError(f"Plugin with UUID '{manifest['uuid']}' already exists (plugin: {existing['id']})")
-
-    # Check for duplicate ID
+    # Check for duplicates
+    existing = registry.find_plugin_by_url(git_url)
+    if existing:
+        raise DuplicateURLError(f"Plugin with git URL '{git_url}' already exists (plugin: {existing['id']})")
+    existing = registry.find_plugin_by_uuid(manifest["uuid"])
+    if existing:
+        raise DuplicateUUIDError(f"Plugin with UUID '{manifest['uuid']}' already exists (plugin: {existing['id']})")
     if registry.find_plugin(plugin_id):
-        raise ValueError(f"Plugin with ID '{plugin_id}' already exists")
+        raise DuplicateIDError(f"Plugin with ID '{plugin_id}' already exists")
 
     # Build plugin entry
-    now = now_iso8601()
+    now = now or now_iso8601()
     plugin = {
         "id": plugin_id,
         "uuid": manifest["uuid"],
-        "name": _strip_field(manifest["name"], "name", plugin_id),
-        "description": _strip_field(manifest["description"], "description", plugin_id),
+        "name": _strip_field(manifest["name"], "name", plugin_id, stacklevel=3),
+        "description": _strip_field(manifest["description"], "description", plugin_id, stacklevel=3),
         "git_url": git_url,
         "categories": categories or manifest.get("categories", []),
         "trust_level": trust_level,
@@ -130,7 +170,7 @@ def add_plugin(
     }
 
     # Add optional fields
-    _sync_optional_fields(plugin, manifest, _OPTIONAL_MANIFEST_FIELDS)
+    _sync_optional_fields(plugin, manifest, _OPTIONAL_MANIFEST_FIELDS, stacklevel=3)
 
     # Add refs if not default single main
     if not (len(refs_list) == 1 and refs_list[0]["name"] == DEFAULT_REF and "min_api_version" not in refs_list[0]):
@@ -180,48 +220,121 @@ def _parse_refs(refs_str: str) -> list[dict[str, str]]:
     return refs
 
 
-def update_plugin(registry: Registry, plugin_id: str, ref: str | None = None) -> dict[str, Any]:
+def _default_ref(plugin: dict[str, Any]) -> str:
+    """Get the ref to fetch the MANIFEST from: the first ref or main."""
+    refs = plugin.get("refs", None)
+    if refs:
+        return str(refs[0]["name"])
+    return DEFAULT_REF
+
+
+def _apply_manifest(plugin: dict[str, Any], manifest: dict[str, Any], now: str, stacklevel: int = 2) -> None:
+    """Validate manifest and update plugin fields from it.
+
+    Args:
+        plugin: Plugin entry to update
+        manifest: Parsed MANIFEST.toml dict
+        now: Timestamp to use for updated_at
+        stacklevel: Stack level of whitespace warnings, relative to this function
+
+    Raises:
+        ManifestValidationError: If manifest validation fails
+        UUIDMismatchError: If UUID changed
+    """
+    validate_manifest(manifest)
+
+    # Check UUID hasn't changed
+    if manifest["uuid"] != plugin["uuid"]:
+        raise UUIDMismatchError(
+            f"UUID mismatch: MANIFEST has {manifest['uuid']} but registry has {plugin['uuid']}. UUIDs must not change."
+        )
+
+    # Update fields from manifest
+    plugin_id = plugin["id"]
+    plugin["name"] = _strip_field(manifest["name"], "name", plugin_id, stacklevel + 1)
+    plugin["description"] = _strip_field(manifest["description"], "description", plugin_id, stacklevel + 1)
+    plugin["authors"] = manifest.get("authors", [])
+    plugin["updated_at"] = now
+
+    # Update optional fields
+    _sync_optional_fields(plugin, manifest, _OPTIONAL_MANIFEST_FIELDS, stacklevel + 1)
+
+
+def update_plugin(registry: Registry, plugin_id: str, ref: str | None = None, now: str | None = None) -> dict[str, Any]:
     """Update plugin metadata from MANIFEST.
 
     Args:
         registry: Registry instance
         plugin_id: Plugin ID to update
         ref: Git ref to fetch from (optional, defaults to first ref or main)
+        now: Timestamp to use for updated_at (optional, defaults to current time)
 
     Returns:
         dict: Updated plugin entry
 
     Raises:
-        ValueError: If plugin not found, validation fails, or UUID changed
+        ValueError: If plugin not found
+        ManifestValidationError: If manifest validation fails
+        UUIDMismatchError: If UUID changed
     """
     plugin = registry.find_plugin(plugin_id)
     if not plugin:
         raise ValueError(f"Plugin {plugin_id} not found")
 
-    if ref is None:
-        refs = plugin.get("refs", None)
-        if refs:
-            ref = str(refs[0]["name"])
-        else:
-            ref = DEFAULT_REF
-
     # Fetch and validate manifest
-    manifest = fetch_manifest(plugin["git_url"], ref)
-    validate_manifest(manifest)
+    manifest = fetch_manifest(plugin["git_url"], ref or _default_ref(plugin))
+    _apply_manifest(plugin, manifest, now or now_iso8601(), stacklevel=3)
 
-    # Check UUID hasn't changed
-    if manifest["uuid"] != plugin["uuid"]:
-        raise ValueError(
-            f"UUID mismatch: MANIFEST has {manifest['uuid']} but registry has {plugin['uuid']}. UUIDs must not change."
-        )
+    registry.mark_changed()
+    return plugin
 
-    # Update fields from manifest
-    plugin["name"] = _strip_field(manifest["name"], "name", plugin_id)
-    plugin["description"] = _strip_field(manifest["description"], "description", plugin_id)
-    plugin["authors"] = manifest.get("authors", [])
-    plugin["updated_at"] = now_iso8601()
 
-    # Update optional fields
-    _sync_optional_fields(plugin, manifest, _OPTIONAL_MANIFEST_FIELDS)
+def update_plugins(
+    registry: Registry,
+    plugin_ids: list[str] | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    now: str | None = None,
+) -> tuple[list[dict[str, Any]], dict[str, Exception]]:
+    """Update metadata of several plugins from their MANIFEST.
 
-    return plugin
+    The manifests are fetched concurrently from each plugin's default ref,
+    the plugin entries are then updated one after the other.
+
+    Args:
+        registry: Registry instance
+        plugin_ids: Plugin IDs to update (optional, defaults to all plugins)
+        max_workers: Maximum number of concurrent fetches
+        now: Timestamp to use for updated_at (optional, defaults to current time)
+
+    Returns:
+        tuple: List of updated plugin entries and a dict mapping the IDs of
+            plugins that could not be updated to the error
+    """
+    errors: dict[str, Exception] = {}
+    if plugin_ids is None:
+        plugins = list(registry.data["plugins"])
+    else:
+        plugins = []
+        for plugin_id in plugin_ids:
+            plugin = registry.find_plugin(plugin_id)
+            if plugin:
+                plugins.append(plugin)
+            else:
+                errors[plugin_id] = ValueError(f"Plugin {plugin_id} not found")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(fetch_manifest, plugin["git_url"], _default_ref(plugin)) for plugin in plugins]
+
+    now = now or now_iso8601()
+    updated = []
+    for plugin, future in zip(plugins, futures, strict=True):
+        try:
+            _apply_manifest(plugin, future.result(), now, stacklevel=3)
+        except Exception as e:
+            errors[plugin["id"]] = e
+        else:
+            updated.append(plugin)
+
+    if updated:
+        registry.mark_changed()
+    return updated, errors
@@ -1,7 +1,13 @@
 """Registry management."""
 
+from collections.abc import Generator
+from contextlib import contextmanager
+from operator import itemgetter
+import os
 from pathlib import Path
+import stat
 import sys
+import tempfile
 
 
 if sys.version_info >= (3, 11):
@@ -28,32 +34,71 @@ class Registry:
             path: Path to plugins.toml file
         """
         self.path = Path(path)
+        # File content as last loaded or saved, None if there is no file yet
+        self._saved_content: bytes | None = None
+        # Nesting depth of transaction() blocks, saving is deferred while inside one
+        self._transaction_depth = 0
         self.data = self._load()
+        # Lookup indexes, built on first use and kept in sync or reset on changes
+        self._plugins_by_id: dict[str, dict[str, Any]] | None = None
+        self._plugins_by_uuid: dict[str, dict[str, Any]] | None = None
+        self._plugins_by_url: dict[str, dict[str, Any]] | None = None
+        self._blacklist_by_uuid: dict[str, dict[str, str]] | None = None
+        self._blacklist_by_url: dict[str, dict[str, str]] | None = None
 
     def _load(self) -> dict[str, Any]:
         """Load registry from file or create new."""
-        if not self.path.exists():
+        # Read the file in one go instead of checking for existence first
+        try:
+            content = self.path.read_bytes()
+        except FileNotFoundError:
             return {
                 "api_version": "3.0",
                 "plugins": [],
                 "blacklist": [],
             }
         try:
-            with open(self.path, "rb") as f:
-                data = tomllib.load(f)
-                # Ensure blacklist key exists (may be omitted in TOML)
-                if "blacklist" not in data:
-                    data["blacklist"] = []
-                return data
+            data = tomllib.loads(content.decode())
         except tomllib.TOMLDecodeError as e:
             raise ValueError(f"Invalid TOML in {self.path}: {e}") from e
+        self._saved_content = content
+        # Ensure blacklist key exists (may be omitted in TOML)
+        if "blacklist" not in data:
+            data["blacklist"] = []
+        return data
+
+    def mark_changed(self) -> None:
+        """Mark registry as changed.
+
+        Must be called after modifying plugin entries in place, so lookups by
+        UUID or git URL see the new values.
+        """
+        # Edits may have changed a plugin's git URL
+        self._plugins_by_uuid = None
+        self._plugins_by_url = None
+
+    @contextmanager
+    def transaction(self) -> Generator["Registry", None, None]:
+        """Group changes so they are written with a single save.
+
+        save() calls inside the block are deferred. The registry is saved once
+        when the outermost block exits, unless it exits with an exception.
+        """
+        self._transaction_depth += 1
+        try:
+            yield self
+        finally:
+            self._transaction_depth -= 1
+        self.save()
 
     def save(self) -> None:
-        """Save registry to file."""
+        """Save registry to file, unless the content is the same as on disk."""
+        if self._transaction_depth:
+            return
         if not tomli_w:
             raise RuntimeError("tomli-w is required to save registry")
         # Sort plugins by ID for consistent ordering
-        self.data["plugins"] = sorted(self.data["plugins"], key=lambda p: p["id"])
+        self.data["plugins"].sort(key=itemgetter("id"))
 
         # Prepare data for saving (remove empty arrays)
         save_data = {"api_version": self.data["api_version"]}
@@ -62,8 +107,32 @@ class Registry:
         if self.data.get("blacklist"):
             save_data["blacklist"] = self.data["blacklist"]
 
-        with open(self.path, "wb") as f:
-            tomli_w.dump(save_data, f, multiline_strings=True, indent=2)
+        # Compare the serialized data instead of tracking changes, so edits
+        # made in place are never lost
+        content = tomli_w.dumps(save_data, multiline_strings=True, indent=2).encode()
+        if content == self._saved_content:
+            return
+
+        # Write to a temporary file and move it in place, so an interrupted
+        # save can not leave a truncated registry behind
+        try:
+            mode = stat.S_IMODE(self.path.stat().st_mode)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._saved_content = content
 
     def find_plugin(self, plugin_id: str) -> dict[str, Any] | None:
         """Find plugin by ID.
@@ -74,10 +143,48 @@ class Registry:
         Returns:
             dict or None: Plugin entry if found
         """
-        for plugin in self.data["plugins"]:
-            if plugin["id"] == plugin_id:
-                return plugin
-        return None
+        return self._get_plugins_by_id().get(plugin_id)
+
+    def _get_plugins_by_id(self) -> dict[str, dict[str, Any]]:
+        """Get the plugin ID index, building it if needed."""
+        if self._plugins_by_id is None:
+            # Iterate in reverse so the first plugin wins on duplicate IDs
+            self._plugins_by_id = {p["id"]: p for p in reversed(self.data["plugins"])}
+        return self._plugins_by_id
+
+    def find_plugin_by_uuid(self, uuid: str) -> dict[str, Any] | None:
+        """Find plugin by UUID.
+
+        Args:
+            uuid: Plugin UUID
+
+        Returns:
+            dict or None: Plugin entry if found
+        """
+        return self._get_plugins_by_uuid().get(uuid)
+
+    def _get_plugins_by_uuid(self) -> dict[str, dict[str, Any]]:
+        """Get the plugin UUID index, building it if needed."""
+        if self._plugins_by_uuid is None:
+            self._plugins_by_uuid = {p["uuid"]: p for p in reversed(self.data["plugins"]) if "uuid" in p}
+        return self._plugins_by_uuid
+
+    def find_plugin_by_url(self, git_url: str) -> dict[str, Any] | None:
+        """Find plugin by git URL.
+
+        Args:
+            git_url: Git repository URL
+
+        Returns:
+            dict or None: Plugin entry if found
+        """
+        return self._get_plugins_by_url().get(git_url)
+
+    def _get_plugins_by_url(self) -> dict[str, dict[str, Any]]:
+        """Get the plugin git URL index, building it if needed."""
+        if self._plugins_by_url is None:
+            self._plugins_by_url = {p["git_url"]: p for p in reversed(self.data["plugins"]) if "git_url" in p}
+        return self._plugins_by_url
 
     def add_plugin(self, plugin: dict[str, Any]) -> None:
         """Add plugin to registry.
@@ -86,6 +193,12 @@ class Registry:
             plugin: Plugin dict with all required fields
         """
         self.data["plugins"].append(plugin)
+        if self._plugins_by_id is not None:
+            self._plugins_by_id.setdefault(plugin["id"], plugin)
+        if self._plugins_by_uuid is not None and "uuid" in plugin:
+            self._plugins_by_uuid.setdefault(plugin["uuid"], plugin)
+        if self._plugins_by_url is not None and "git_url" in plugin:
+            self._plugins_by_url.setdefault(plugin["git_url"], plugin)
 
     def remove_plugin(self, plugin_id: str) -> None:
         """Remove plugin from registry.
@@ -93,7 +206,12 @@ class Registry:
         Args:
             plugin_id: Plugin ID
         """
-        self.data["plugins"] = [p for p in self.data["plugins"] if p["id"] != plugin_id]
+        if self._get_plugins_by_id().pop(plugin_id, None) is None:
+            return
+        # Filter in place, so references to the plugin list stay valid
+        self.data["plugins"][:] = [p for p in self.data["plugins"] if p["id"] != plugin_id]
+        self._plugins_by_uuid = None
+        self._plugins_by_url = None
 
     def add_blacklist(self, entry: dict[str, str]) -> None:
         """Add blacklist entry.
@@ -102,6 +220,8 @@ class Registry:
             entry: Blacklist dict with url and reason
         """
         self.data["blacklist"].append(entry)
+        self._blacklist_by_uuid = None
+        self._blacklist_by_url = None
 
     def remove_blacklist(self, url: str | None = None, uuid: str | None = None) -> None:
         """Remove blacklist entry.
@@ -110,6 +230,36 @@ class Registry:
             url: Git URL to remove (optional)
             uuid: Plugin UUID to remove (optional)
         """
-        self.data["blacklist"] = [
+        blacklist = [
             e for e in self.data["blacklist"] if not ((url and e.get("url") == url) or (uuid and e.get("uuid") == uuid))
         ]
+        if len(blacklist) != len(self.data["blacklist"]):
+            self.data["blacklist"][:] = blacklist
+            self._blacklist_by_uuid = None
+            self._blacklist_by_url = None
+
+    def find_blacklist(self, url: str | None = None, uuid: str | None = None) -> dict[str, str] | None:
+        """Find blacklist entry by URL or UUID.
+
+        Args:
+            url: Git URL (optional)
+            uuid: Plugin UUID (optional)
+
+        Returns:
+            dict or None: Blacklist entry if found, UUID matches take precedence
+        """
+        if self._blacklist_by_uuid is None or self._blacklist_by_url is None:
+            self._blacklist_by_uuid = {}
+            self._blacklist_by_url = {}
+            for entry in self.data["blacklist"]:
+                if "uuid" in entry:
+                    self._blacklist_by_uuid.setdefault(entry["uuid"], entry)
+                if "url" in entry:
+                    self._blacklist_by_url.setdefault(entry["url"], entry)
+
+        entry = None
+        if uuid:
+            entry = self._blacklist_by_uuid.get(uuid)
+        if entry is None and url:
+            entry = self._blacklist_by_url.get(url)
+        return entry
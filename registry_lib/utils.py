@@ -1,10 +1,14 @@
 """Utility functions for registry management."""
 
-from datetime import (
-    datetime,
-    timezone,
-)
 import re
+import time
+
+
+REPO_NAME_RE = re.compile(r"/([^/]+?)(?:\.git)?$")
+NON_ID_CHARS_RE = re.compile(r"[^a-z0-9]+")
+
+# Repository name prefixes not included in plugin IDs, longest first
+PLUGIN_ID_PREFIXES = ("picard-plugin-", "picard-", "plugin-")
 
 
 def derive_plugin_id(git_url: str) -> str:
@@ -23,23 +27,20 @@ def derive_plugin_id(git_url: str) -> str:
         'my-plugin'
     """
     # Extract repo name from URL
-    match = re.search(r"/([^/]+?)(?:\.git)?$", git_url.rstrip("/"))
+    match = REPO_NAME_RE.search(git_url.rstrip("/"))
     if not match:
         raise ValueError(f"Cannot derive plugin ID from URL: {git_url}")
 
-    repo_name = match.group(1)
-
-    # Remove common prefixes
-    for prefix in ["picard-plugin-", "picard-", "plugin-"]:
-        if repo_name.lower().startswith(prefix):
-            repo_name = repo_name[len(prefix) :]
+    # Normalize to lowercase and remove common prefixes
+    plugin_id = match.group(1).lower()
+    for prefix in PLUGIN_ID_PREFIXES:
+        if plugin_id.startswith(prefix):
+            plugin_id = plugin_id[len(prefix) :]
             break
 
-    # Normalize to lowercase with hyphens
-    plugin_id = repo_name.lower()
-    plugin_id = re.sub(r"[^a-z0-9-]", "-", plugin_id)
-    plugin_id = re.sub(r"-+", "-", plugin_id)
-    plugin_id = plugin_id.strip("-")
+    # Replace each run of anything else than letters and digits, including
+    # hyphens, by a single hyphen
+    plugin_id = NON_ID_CHARS_RE.sub("-", plugin_id).strip("-")
 
     if not plugin_id:
         raise ValueError(f"Cannot derive valid plugin ID from URL: {git_url}")
@@ -53,4 +54,4 @@ def now_iso8601() -> str:
     Returns:
         str: ISO 8601 timestamp like "2025-12-01T10:30:00Z"
     """
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
@@ -0,0 +1,43 @@
+"""Shared test fixtures."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from registry_lib.manifest import (
+    _fetch_manifest_text,
+    _valid_manifests,
+)
+from registry_lib.registry import Registry
+from tests.manifests import MANIFEST
+
+
+@pytest.fixture(autouse=True)
+def clear_manifest_cache():
+    """Clear fetched and validated manifests cached between tests."""
+    _fetch_manifest_text.cache_clear()
+    _valid_manifests.clear()
+
+
+@pytest.fixture(scope="session")
+def unsaved_registry_dir(tmp_path_factory):
+    """Path to a directory that is never created, registries in it only live in memory."""
+    return tmp_path_factory.getbasetemp() / "unsaved"
+
+
+@pytest.fixture
+def temp_registry(unsaved_registry_dir):
+    """Create temporary in-memory registry.
+
+    The registry file does not exist, so nothing is read, and saving fails
+    because its directory is missing. Tests that need the file use tmp_path.
+    """
+    return Registry(str(unsaved_registry_dir / "plugins.toml"))
+
+
+@pytest.fixture
+def mock_fetch(monkeypatch):
+    """Replace the manifest fetching used by plugin operations with a mock returning MANIFEST."""
+    mock = Mock(return_value=MANIFEST)
+    monkeypatch.setattr("registry_lib.plugin.fetch_manifest", mock)
+    return mock
@@ -0,0 +1,10 @@
+"""Manifest data shared by the tests."""
+
+# Minimal valid manifest, tests build variants with {**MANIFEST, ...}
+MANIFEST = {
+    "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
+    "name": "Test Plugin",
+    "version": "1.0.0",
+    "description": "A test plugin",
+    "api": ["3.0"],
+}
@@ -3,13 +3,6 @@
 import pytest
 
 from registry_lib.blacklist import add_blacklist
-from registry_lib.registry import Registry
-
-
-@pytest.fixture
-def temp_registry(tmp_path):
-    """Create temporary registry."""
-    return Registry(str(tmp_path / "plugins.toml"))
 
 
 def test_add_blacklist_by_url(temp_registry):
@@ -52,6 +45,23 @@ def test_add_blacklist_uuid_and_url(temp_registry):
     assert entry["url"] == "https://github.com/bad/plugin"
 
 
+def test_add_blacklist_with_timestamp(temp_registry):
+    """Test adding blacklist entry with a given timestamp."""
+    entry = add_blacklist(
+        temp_registry, url="https://github.com/bad/plugin", reason="Malicious code", now="2025-01-01T00:00:00Z"
+    )
+
+    assert entry["blacklisted_at"] == "2025-01-01T00:00:00Z"
+
+
+def test_add_blacklist_invalid_regex(temp_registry):
+    """Test adding blacklist with an invalid URL regex fails."""
+    with pytest.raises(ValueError, match="Invalid URL regex"):
+        add_blacklist(temp_registry, url_regex="^https://github.com/bad(", reason="Bad")
+
+    assert temp_registry.data["blacklist"] == []
+
+
 def test_add_blacklist_no_identifier(temp_registry):
     """Test adding blacklist without identifier fails."""
     with pytest.raises(ValueError, match="At least one"):
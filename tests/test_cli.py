@@ -1,25 +1,63 @@
 """Tests for CLI module."""
 
-from unittest.mock import patch
+import json
+import os
+from unittest.mock import (
+    ANY,
+    MagicMock,
+    patch,
+)
+
+import pytest
+
+from registry_lib.cli import (
+    _build_parser,
+    _find_command,
+    main,
+)
+from registry_lib.registry import Registry
+from tests.manifests import MANIFEST
+
 
-from registry_lib.cli import main
+def cli_argv(*args):
+    """Build sys.argv for running the CLI with the given arguments."""
+    return ["registry", *args]
 
 
-@patch("sys.argv", ["registry", "--registry", "test.toml", "plugin", "list"])
-@patch("registry_lib.cli.Registry")
-def test_cli_plugin_list(mock_registry):
-    """Test plugin list command."""
-    mock_registry.return_value.data = {"plugins": [{"id": "test", "name": "Test", "trust_level": "community"}]}
+@pytest.fixture
+def mock_registry(monkeypatch):
+    """Replace the registry opened by the CLI commands with a mock."""
+    mock = MagicMock()
+    monkeypatch.setattr("registry_lib.cli.Registry", mock)
+    return mock
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        ["plugin", "list"],
+        ["blacklist", "list"],
+        ["stats"],
+    ],
+)
+def test_cli_registry_option(mock_registry, monkeypatch, command):
+    """Test the --registry option selects the registry file."""
+    monkeypatch.setattr("sys.argv", cli_argv("--registry", "test.toml", *command))
+
+    mock_registry.return_value.data = {
+        "plugins": [{"id": "test", "name": "Test", "trust_level": "community"}],
+        "blacklist": [{"url": "https://github.com/bad/plugin", "reason": "Bad"}],
+    }
 
     main()
 
     mock_registry.assert_called_once_with("test.toml")
 
 
-@patch("sys.argv", ["registry", "plugin", "list", "--verbose"])
-@patch("registry_lib.cli.Registry")
-def test_cli_plugin_list_verbose(mock_registry):
+def test_cli_plugin_list_verbose(mock_registry, monkeypatch):
     """Test plugin list verbose command."""
+    monkeypatch.setattr("sys.argv", cli_argv("plugin", "list", "--verbose"))
+
     mock_registry.return_value.data = {
         "plugins": [
             {
@@ -46,118 +84,177 @@ def test_cli_plugin_list_verbose(mock_registry):
     # Should print detailed info without errors
 
 
-@patch("sys.argv", ["registry", "--registry", "test.toml", "blacklist", "list"])
-@patch("registry_lib.cli.Registry")
-def test_cli_blacklist_list(mock_registry):
+def test_cli_blacklist_list(mock_registry, capsys, monkeypatch):
     """Test blacklist list command."""
-    mock_registry.return_value.data = {"blacklist": [{"url": "https://github.com/bad/plugin", "reason": "Bad"}]}
+    monkeypatch.setattr("sys.argv", cli_argv("blacklist", "list"))
+
+    mock_registry.return_value.data = {
+        "blacklist": [
+            {"url": "https://github.com/bad/plugin", "reason": "Bad"},
+            {"uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246", "url_regex": "^https://bad\\.example/", "reason": "Worse"},
+        ]
+    }
 
     main()
 
-    mock_registry.assert_called_once_with("test.toml")
+    assert capsys.readouterr().out == (
+        "URL:https://github.com/bad/plugin: Bad\n"
+        "UUID:6de6a3bf-a524-42b6-83cb-a36b2ec2e246, REGEX:^https://bad\\.example/: Worse\n"
+    )
 
 
-@patch("sys.argv", ["registry", "plugin", "add", "https://github.com/user/plugin", "--trust", "community"])
+@pytest.mark.parametrize(
+    ("argv", "versioning_scheme"),
+    [
+        pytest.param([], None, id="default"),
+        pytest.param(["--versioning-scheme", "semver"], "semver", id="versioning-scheme"),
+    ],
+)
 @patch("registry_lib.cli.add_plugin")
-@patch("registry_lib.cli.Registry")
-def test_cli_plugin_add(mock_registry, mock_add_plugin):
+def test_cli_plugin_add(mock_add_plugin, mock_registry, argv, versioning_scheme, monkeypatch):
     """Test plugin add command."""
+    monkeypatch.setattr(
+        "sys.argv", cli_argv("plugin", "add", "https://github.com/user/plugin", "--trust", "community", *argv)
+    )
     mock_add_plugin.return_value = {"id": "plugin", "name": "Plugin"}
 
     main()
 
     mock_add_plugin.assert_called_once()
+    assert mock_add_plugin.call_args[1]["versioning_scheme"] == versioning_scheme
+    mock_registry.return_value.save.assert_called_once()
+
+
+@patch("registry_lib.cli.update_plugins")
+def test_cli_plugin_update_all(mock_update_plugins, mock_registry, capsys, monkeypatch):
+    """Test plugin update-all command."""
+    monkeypatch.setattr("sys.argv", cli_argv("plugin", "update-all"))
+
+    mock_update_plugins.return_value = (
+        [{"id": "plugin-a", "name": "Plugin A"}],
+        {"plugin-b": ValueError("UUID mismatch")},
+    )
+
+    with pytest.raises(SystemExit) as exc_info:
+        main()
+
+    assert exc_info.value.code == 1
     mock_registry.return_value.save.assert_called_once()
+    captured = capsys.readouterr()
+    assert "Updated plugin: Plugin A (plugin-a)" in captured.out
+    assert "Error: plugin-b: UUID mismatch" in captured.err
 
 
-@patch(
-    "sys.argv",
+@pytest.mark.parametrize(
+    ("argv", "plugin_ids", "max_workers"),
     [
-        "registry",
-        "plugin",
-        "add",
-        "https://github.com/user/plugin",
-        "--trust",
-        "community",
-        "--versioning-scheme",
-        "semver",
+        pytest.param([], None, 8, id="default"),
+        pytest.param(["plugin-a", "plugin-b", "--jobs", "2"], ["plugin-a", "plugin-b"], 2, id="options"),
     ],
 )
-@patch("registry_lib.cli.add_plugin")
-@patch("registry_lib.cli.Registry")
-def test_cli_plugin_add_with_versioning_scheme(mock_registry, mock_add_plugin):
-    """Test plugin add command with versioning scheme."""
-    mock_add_plugin.return_value = {"id": "plugin", "name": "Plugin"}
+@patch("registry_lib.cli.update_plugins", return_value=([], {}))
+def test_cli_plugin_update_all_options(mock_update_plugins, mock_registry, argv, plugin_ids, max_workers, monkeypatch):
+    """Test plugin update-all passes the plugin IDs and number of jobs."""
+    monkeypatch.setattr("sys.argv", cli_argv("plugin", "update-all", *argv))
 
     main()
 
-    args = mock_add_plugin.call_args
-    assert args[1]["versioning_scheme"] == "semver"
-    mock_registry.return_value.save.assert_called_once()
+    mock_update_plugins.assert_called_once_with(
+        mock_registry.return_value, plugin_ids, max_workers=max_workers, now=ANY
+    )
 
 
-@patch("sys.argv", ["registry", "plugin", "edit", "test-plugin", "--trust", "official"])
-@patch("registry_lib.cli.Registry")
-def test_cli_plugin_edit(mock_registry):
+@pytest.mark.parametrize(
+    ("argv", "fields", "expected"),
+    [
+        pytest.param(["--trust", "official"], {}, {"trust_level": "official"}, id="trust"),
+        pytest.param(
+            ["--versioning-scheme", "semver"],
+            {},
+            {"trust_level": "community", "versioning_scheme": "semver"},
+            id="versioning-scheme",
+        ),
+        pytest.param(
+            ["--versioning-scheme", ""],
+            {"versioning_scheme": "semver"},
+            {"trust_level": "community"},
+            id="remove-versioning-scheme",
+        ),
+    ],
+)
+def test_cli_plugin_edit(mock_registry, argv, fields, expected, monkeypatch):
     """Test plugin edit command."""
-    mock_plugin = {"id": "test-plugin", "name": "Test Plugin", "trust_level": "community"}
+    mock_plugin = {"id": "test-plugin", "name": "Test Plugin", "trust_level": "community", **fields}
     mock_registry.return_value.find_plugin.return_value = mock_plugin
 
+    monkeypatch.setattr("sys.argv", cli_argv("plugin", "edit", "test-plugin", *argv))
     main()
 
-    assert mock_plugin["trust_level"] == "official"
+    assert mock_plugin.pop("updated_at")
+    assert mock_plugin == {"id": "test-plugin", "name": "Test Plugin", **expected}
     mock_registry.return_value.save.assert_called_once()
 
 
-@patch("sys.argv", ["registry", "plugin", "edit", "test-plugin", "--versioning-scheme", "semver"])
-@patch("registry_lib.cli.Registry")
-def test_cli_plugin_edit_versioning_scheme(mock_registry):
-    """Test plugin edit command with versioning scheme."""
-    mock_plugin = {"id": "test-plugin", "name": "Test Plugin", "trust_level": "community"}
+def test_cli_plugin_redirect(mock_registry, monkeypatch):
+    """Test plugin redirect command."""
+    monkeypatch.setattr("sys.argv", cli_argv("plugin", "redirect", "test-plugin", "https://github.com/old/url"))
+
+    mock_plugin = {"id": "test-plugin", "name": "Test Plugin", "git_url": "https://github.com/new/url"}
     mock_registry.return_value.find_plugin.return_value = mock_plugin
 
     main()
 
-    assert mock_plugin["versioning_scheme"] == "semver"
+    assert "redirect_from" in mock_plugin
+    assert "https://github.com/old/url" in mock_plugin["redirect_from"]
     mock_registry.return_value.save.assert_called_once()
 
 
-@patch("sys.argv", ["registry", "plugin", "edit", "test-plugin", "--versioning-scheme", ""])
-@patch("registry_lib.cli.Registry")
-def test_cli_plugin_edit_remove_versioning_scheme(mock_registry):
-    """Test plugin edit command removing versioning scheme."""
+def test_cli_plugin_redirect_existing(mock_registry, monkeypatch):
+    """Test plugin redirect command with an already redirected URL."""
+    monkeypatch.setattr("sys.argv", cli_argv("plugin", "redirect", "test-plugin", "https://github.com/old/url"))
+
     mock_plugin = {
         "id": "test-plugin",
         "name": "Test Plugin",
-        "trust_level": "community",
-        "versioning_scheme": "semver",
+        "git_url": "https://github.com/new/url",
+        "redirect_from": ["https://github.com/old/url"],
+        "updated_at": "2025-01-01T00:00:00Z",
     }
     mock_registry.return_value.find_plugin.return_value = mock_plugin
 
     main()
 
-    assert "versioning_scheme" not in mock_plugin
-    mock_registry.return_value.save.assert_called_once()
+    assert mock_plugin["redirect_from"] == ["https://github.com/old/url"]
+    assert mock_plugin["updated_at"] == "2025-01-01T00:00:00Z"
+    mock_registry.return_value.save.assert_not_called()
 
 
-@patch("sys.argv", ["registry", "plugin", "redirect", "test-plugin", "https://github.com/old/url"])
-@patch("registry_lib.cli.Registry")
-def test_cli_plugin_redirect(mock_registry):
-    """Test plugin redirect command."""
-    mock_plugin = {"id": "test-plugin", "name": "Test Plugin", "git_url": "https://github.com/new/url"}
+def test_cli_plugin_redirect_remove(mock_registry, monkeypatch):
+    """Test plugin redirect remove command."""
+    monkeypatch.setattr(
+        "sys.argv", cli_argv("plugin", "redirect", "test-plugin", "https://github.com/old/url", "--remove")
+    )
+
+    mock_plugin = {
+        "id": "test-plugin",
+        "name": "Test Plugin",
+        "git_url": "https://github.com/new/url",
+        "redirect_from": ["https://github.com/old/url"],
+    }
     mock_registry.return_value.find_plugin.return_value = mock_plugin
 
     main()
 
-    assert "redirect_from" in mock_plugin
-    assert "https://github.com/old/url" in mock_plugin["redirect_from"]
+    assert "redirect_from" not in mock_plugin
     mock_registry.return_value.save.assert_called_once()
 
 
-@patch("sys.argv", ["registry", "plugin", "redirect", "test-plugin", "https://github.com/old/url", "--remove"])
-@patch("registry_lib.cli.Registry")
-def test_cli_plugin_redirect_remove(mock_registry):
-    """Test plugin redirect remove command."""
+def test_cli_plugin_redirect_remove_missing(mock_registry, capsys, monkeypatch):
+    """Test plugin redirect remove command with an unknown URL."""
+    monkeypatch.setattr(
+        "sys.argv", cli_argv("plugin", "redirect", "test-plugin", "https://github.com/other/url", "--remove")
+    )
+
     mock_plugin = {
         "id": "test-plugin",
         "name": "Test Plugin",
@@ -166,16 +263,38 @@ def test_cli_plugin_redirect_remove(mock_registry):
     }
     mock_registry.return_value.find_plugin.return_value = mock_plugin
 
+    with pytest.raises(SystemExit):
+        main()
+
+    assert mock_plugin["redirect_from"] == ["https://github.com/old/url"]
+    assert "Redirect https://github.com/other/url not found" in capsys.readouterr().err
+    mock_registry.return_value.save.assert_not_called()
+
+
+def test_cli_plugin_redirect_list(mock_registry, capsys, monkeypatch):
+    """Test plugin redirect list command."""
+    monkeypatch.setattr("sys.argv", cli_argv("plugin", "redirect", "test-plugin", "--list"))
+
+    mock_plugin = {
+        "id": "test-plugin",
+        "name": "Test Plugin",
+        "git_url": "https://github.com/new/url",
+        "redirect_from": ["https://github.com/old/url", "https://github.com/older/url"],
+    }
+    mock_registry.return_value.find_plugin.return_value = mock_plugin
+
     main()
 
-    assert "redirect_from" not in mock_plugin
-    mock_registry.return_value.save.assert_called_once()
+    assert capsys.readouterr().out == (
+        "https://github.com/old/url -> https://github.com/new/url\n"
+        "https://github.com/older/url -> https://github.com/new/url\n"
+    )
 
 
-@patch("sys.argv", ["registry", "validate"])
-@patch("registry_lib.cli.Registry")
-def test_cli_validate(mock_registry):
+def test_cli_validate(mock_registry, monkeypatch):
     """Test validate command."""
+    monkeypatch.setattr("sys.argv", cli_argv("validate"))
+
     mock_registry.return_value.data = {
         "plugins": [{"id": "p1", "uuid": "u1", "git_url": "url1"}],
         "blacklist": [],
@@ -186,10 +305,33 @@ def test_cli_validate(mock_registry):
     # Should not raise any errors
 
 
-@patch("sys.argv", ["registry", "plugin", "show", "test-plugin"])
-@patch("registry_lib.cli.Registry")
-def test_cli_plugin_show(mock_registry):
+def test_cli_validate_duplicates(mock_registry, capsys, monkeypatch):
+    """Test validate command reports which keys are duplicated."""
+    monkeypatch.setattr("sys.argv", cli_argv("validate"))
+
+    mock_registry.return_value.data = {
+        "plugins": [
+            {"id": "p1", "uuid": "u1", "git_url": "url1"},
+            {"id": "p1", "uuid": "u2", "git_url": "url1"},
+            {"id": "p3", "uuid": "u2", "git_url": "url3"},
+        ],
+        "blacklist": [],
+    }
+
+    with pytest.raises(SystemExit) as exc_info:
+        main()
+
+    assert exc_info.value.code == 1
+    captured = capsys.readouterr()
+    assert "Duplicate plugin ID: p1" in captured.err
+    assert "Duplicate plugin UUID: u2 (plugin: p3)" in captured.err
+    assert "Duplicate git URL: url1 (plugin: p1)" in captured.err
+
+
+def test_cli_plugin_show(mock_registry, monkeypatch):
     """Test plugin show command."""
+    monkeypatch.setattr("sys.argv", cli_argv("plugin", "show", "test-plugin"))
+
     mock_plugin = {
         "id": "test-plugin",
         "name": "Test Plugin",
@@ -213,25 +355,34 @@ def test_cli_plugin_show(mock_registry):
     # Should print plugin details without errors
 
 
-@patch("sys.argv", ["registry", "stats"])
-@patch("registry_lib.cli.Registry")
-def test_cli_stats(mock_registry):
+def test_cli_stats(mock_registry, capsys, monkeypatch):
     """Test stats command."""
+    monkeypatch.setattr("sys.argv", cli_argv("stats"))
+
     mock_registry.return_value.data = {
         "plugins": [
             {"id": "p1", "trust_level": "official", "categories": ["metadata"]},
             {"id": "p2", "trust_level": "community", "categories": ["metadata", "ui"]},
+            {"id": "p3"},
         ],
         "blacklist": [],
     }
 
     main()
 
+    captured = capsys.readouterr()
+    assert "Total plugins: 3" in captured.out
+    assert "  official: 1" in captured.out
+    assert "  community: 1" in captured.out
+    assert "  unknown: 1" in captured.out
+    assert "  metadata: 2" in captured.out
+    assert "  ui: 1" in captured.out
+
 
-@patch("sys.argv", ["registry", "output"])
-@patch("registry_lib.cli.Registry")
-def test_cli_output_toml(mock_registry, capsys):
+def test_cli_output_toml(mock_registry, capsys, monkeypatch):
     """Test output command with TOML format (default)."""
+    monkeypatch.setattr("sys.argv", cli_argv("output"))
+
     mock_registry.return_value.data = {
         "api_version": "3.0",
         "plugins": [{"id": "test", "name": "Test"}],
@@ -246,10 +397,10 @@ def test_cli_output_toml(mock_registry, capsys):
     assert "id = \"test\"" in captured.out
 
 
-@patch("sys.argv", ["registry", "output", "--format", "json"])
-@patch("registry_lib.cli.Registry")
-def test_cli_output_json(mock_registry, capsys):
+def test_cli_output_json(mock_registry, capsys, monkeypatch):
     """Test output command with JSON format."""
+    monkeypatch.setattr("sys.argv", cli_argv("output", "--format", "json"))
+
     mock_registry.return_value.data = {
         "api_version": "3.0",
         "plugins": [{"id": "test", "name": "Test"}],
@@ -264,3 +415,235 @@ def test_cli_output_json(mock_registry, capsys):
     assert '"id": "test"' in captured.out
 
     # Should print stats without errors
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_cli_output_json_matches_stdlib(mock_registry, use_orjson, capsys, monkeypatch):
+    """Test JSON output is the same with and without orjson."""
+    monkeypatch.setattr("sys.argv", cli_argv("output", "--format", "json"))
+
+    data = {
+        "api_version": "3.0",
+        "plugins": [{"id": "test", "name": "Tëst", "categories": [], "name_i18n": {"de": "Test\n"}}],
+        "blacklist": [],
+    }
+    mock_registry.return_value.data = data
+
+    if use_orjson:
+        pytest.importorskip("orjson")
+        main()
+    else:
+        with patch("registry_lib.cli.orjson", None):
+            main()
+
+    captured = capsys.readouterr()
+    assert captured.out == json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+
+@pytest.mark.parametrize(
+    ("argv", "expected"),
+    [
+        (["plugin", "list"], "plugin"),
+        (["--registry", "stats", "ref", "list", "p1"], "ref"),
+        (["--reg", "plugin", "--no-color", "blacklist", "list"], "blacklist"),
+        (["--registry=test.toml", "stats"], "stats"),
+        (["--help"], None),
+        ([], None),
+    ],
+)
+def test_find_command(argv, expected):
+    """Test finding the top-level command in the arguments."""
+    assert _find_command(argv) == expected
+
+
+def test_build_parser_cached():
+    """Test the parser for a command is only built once."""
+    assert _build_parser("plugin") is _build_parser("plugin")
+    assert _build_parser("plugin") is not _build_parser("ref")
+
+
+def test_cli_plugin_show_matches_list_verbose(mock_registry, capsys, monkeypatch):
+    """Test plugin show and verbose plugin list print the same details."""
+    mock_plugin = {
+        "id": "test-plugin",
+        "name": "Test Plugin",
+        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
+        "description": "A test plugin",
+        "git_url": "https://github.com/user/plugin",
+        "trust_level": "community",
+        "categories": ["metadata"],
+        "authors": ["Test Author"],
+        "redirect_from": ["https://github.com/old/plugin"],
+        "added_at": "2025-01-01T00:00:00Z",
+        "updated_at": "2025-01-01T00:00:00Z",
+    }
+    mock_registry.return_value.data = {"plugins": [mock_plugin]}
+    mock_registry.return_value.find_plugin.return_value = mock_plugin
+
+    monkeypatch.setattr("sys.argv", cli_argv("plugin", "show", "test-plugin"))
+    main()
+    show_output = capsys.readouterr().out
+
+    monkeypatch.setattr("sys.argv", cli_argv("plugin", "list", "--verbose"))
+    main()
+    list_output = capsys.readouterr().out
+
+    assert show_output == list_output
+    assert "Redirects from: https://github.com/old/plugin" in show_output
+
+
+def test_cli_batch(tmp_path, capsys, monkeypatch):
+    """Test batch command runs all commands and writes the registry once."""
+    registry_path = tmp_path / "plugins.toml"
+    batch_path = tmp_path / "commands.txt"
+    batch_path.write_text(
+        "# Block bad plugins\n"
+        "blacklist add --url https://github.com/bad/one --reason 'Malware'\n"
+        "\n"
+        "blacklist add --uuid 6de6a3bf-a524-42b6-83cb-a36b2ec2e246 --reason Broken\n"
+        "blacklist remove --url https://github.com/bad/one\n"
+    )
+
+    monkeypatch.setattr("sys.argv", cli_argv("--registry", str(registry_path), "batch", str(batch_path)))
+    with patch("registry_lib.registry.os.replace", wraps=os.replace) as mock_replace:
+        main()
+
+    mock_replace.assert_called_once()
+    blacklist = Registry(str(registry_path)).data["blacklist"]
+    assert [entry["reason"] for entry in blacklist] == ["Broken"]
+    assert "Removed from blacklist" in capsys.readouterr().out
+
+
+def test_cli_batch_error(tmp_path, capsys, monkeypatch):
+    """Test batch command does not save or report anything done when a command fails."""
+    registry_path = tmp_path / "plugins.toml"
+    batch_path = tmp_path / "commands.txt"
+    batch_path.write_text("blacklist add --url https://github.com/bad/one --reason Bad\nplugin show missing\n")
+
+    monkeypatch.setattr("sys.argv", cli_argv("--registry", str(registry_path), "batch", str(batch_path)))
+    with pytest.raises(SystemExit):
+        main()
+
+    assert not registry_path.exists()
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "batch aborted at line 2, nothing was saved" in captured.err
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "--registry other.toml blacklist add --url https://github.com/bad/one --reason Bad",
+        "--no-color stats",
+    ],
+)
+def test_cli_batch_global_option(tmp_path, capsys, monkeypatch, line):
+    """Test batch command rejects global options instead of ignoring them."""
+    registry_path = tmp_path / "plugins.toml"
+    batch_path = tmp_path / "commands.txt"
+    batch_path.write_text(f"blacklist add --url https://github.com/bad/two --reason Bad\n{line}\n")
+
+    monkeypatch.setattr("sys.argv", cli_argv("--registry", str(registry_path), "batch", str(batch_path)))
+    with pytest.raises(SystemExit):
+        main()
+
+    assert not registry_path.exists()
+    assert not (tmp_path / "other.toml").exists()
+    assert "line 2: global option" in capsys.readouterr().err
+
+
+def test_cli_batch_update_all_errors(tmp_path, mock_fetch, capsys, monkeypatch):
+    """Test update-all in a batch saves the updated plugins like the standalone command."""
+    registry_path = tmp_path / "plugins.toml"
+    registry = Registry(str(registry_path))
+    for plugin_id, uuid, name in [
+        ("alpha", MANIFEST["uuid"], "Alpha"),
+        ("beta", "f47ac10b-58cc-4372-a567-0e02b2c3d479", "Beta"),
+    ]:
+        registry.add_plugin(
+            {
+                "id": plugin_id,
+                "uuid": uuid,
+                "name": name,
+                "description": "A test plugin",
+                "git_url": f"https://github.com/user/{plugin_id}",
+                "categories": [],
+                "trust_level": "community",
+                "authors": [],
+            }
+        )
+    registry.save()
+
+    def fetch_manifest(git_url, ref):
+        if git_url.endswith("/beta"):
+            raise ValueError("Not found")
+        return MANIFEST
+
+    mock_fetch.side_effect = fetch_manifest
+    batch_path = tmp_path / "commands.txt"
+    batch_path.write_text("plugin update-all\nblacklist add --url https://github.com/bad/one --reason Bad\n")
+
+    monkeypatch.setattr("sys.argv", cli_argv("--registry", str(registry_path), "batch", str(batch_path)))
+    with pytest.raises(SystemExit) as exc_info:
+        main()
+
+    assert exc_info.value.code == 1
+    data = Registry(str(registry_path)).data
+    assert [p["name"] for p in data["plugins"]] == ["Test Plugin", "Beta"]
+    assert len(data["blacklist"]) == 1
+    assert "Error: beta: Not found" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    ("argv", "field", "expected"),
+    [
+        pytest.param(["plugin", "edit", "test-plugin", "--trust", "official"], "trust_level", "official", id="edit"),
+        pytest.param(
+            ["plugin", "redirect", "test-plugin", "https://github.com/older/plugin"],
+            "redirect_from",
+            ["https://github.com/old/plugin", "https://github.com/older/plugin"],
+            id="redirect",
+        ),
+        pytest.param(
+            ["plugin", "redirect", "test-plugin", "https://github.com/old/plugin", "--remove"],
+            "redirect_from",
+            None,
+            id="redirect-remove",
+        ),
+        pytest.param(["plugin", "update", "test-plugin"], "name", "Test Plugin", id="update"),
+        pytest.param(
+            ["ref", "edit", "test-plugin", "develop", "--max-api-version", "4.99"],
+            "refs",
+            [{"name": "main"}, {"name": "develop", "max_api_version": "4.99"}],
+            id="ref-edit",
+        ),
+        pytest.param(["ref", "remove", "test-plugin", "develop"], "refs", [{"name": "main"}], id="ref-remove"),
+    ],
+)
+def test_cli_edit_in_place_saved(tmp_path, mock_fetch, monkeypatch, argv, field, expected):
+    """Test commands editing a plugin entry in place write the change to the registry file."""
+    registry_path = tmp_path / "plugins.toml"
+    registry = Registry(str(registry_path))
+    registry.add_plugin(
+        {
+            "id": "test-plugin",
+            "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
+            "name": "Old Name",
+            "description": "A test plugin",
+            "git_url": "https://github.com/user/plugin",
+            "categories": ["metadata"],
+            "trust_level": "community",
+            "authors": [],
+            "redirect_from": ["https://github.com/old/plugin"],
+            "refs": [{"name": "main"}, {"name": "develop"}],
+        }
+    )
+    registry.save()
+    before = registry_path.read_bytes()
+
+    monkeypatch.setattr("sys.argv", cli_argv("--registry", str(registry_path), *argv))
+    main()
+
+    assert registry_path.read_bytes() != before
+    plugin = Registry(str(registry_path)).data["plugins"][0]
+    assert plugin.get(field) == expected
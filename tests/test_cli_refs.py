@@ -1,272 +1,158 @@
 """Tests for CLI ref commands."""
 
-from pathlib import Path
-import sys
-import tempfile
-from unittest.mock import patch
+import copy
+from unittest.mock import Mock
 
-import tomli_w
-
-
-if sys.version_info >= (3, 11):
-    import tomllib
-else:
-    import tomli as tomllib
+import pytest
 
 from registry_lib.cli import main
-
-
-def test_cli_ref_add(capsys):
-    """Test ref add command."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        registry_file = Path(tmpdir) / "plugins.toml"
-        registry_data = {
-            "api_version": "3.0",
-            "plugins": [
-                {
-                    "id": "test-plugin",
-                    "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-                    "name": "Test Plugin",
-                    "description": "A test plugin",
-                    "git_url": "https://github.com/user/plugin",
-                    "categories": ["metadata"],
-                    "trust_level": "community",
-                    "authors": ["Test Author"],
-                    "added_at": "2025-01-01T00:00:00Z",
-                    "updated_at": "2025-01-01T00:00:00Z",
-                }
-            ],
-            "blacklist": [],
-        }
-        registry_file.write_bytes(tomli_w.dumps(registry_data, indent=2).encode())
-
-        with patch(
-            "sys.argv",
+from registry_lib.registry import Registry
+
+
+PLUGIN = {
+    "id": "test-plugin",
+    "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
+    "name": "Test Plugin",
+    "description": "A test plugin",
+    "git_url": "https://github.com/user/plugin",
+    "categories": ["metadata"],
+    "trust_level": "community",
+    "authors": ["Test Author"],
+    "added_at": "2025-01-01T00:00:00Z",
+    "updated_at": "2025-01-01T00:00:00Z",
+}
+
+
+@pytest.fixture
+def cli_registry(tmp_path, monkeypatch):
+    """Create an in-memory registry with one plugin used by the CLI commands.
+
+    Saving is mocked, so tests check registry.data and whether save() was
+    called instead of parsing the file.
+    """
+
+    def make_registry(refs=None):
+        plugin = copy.deepcopy(PLUGIN)
+        if refs is not None:
+            plugin["refs"] = refs
+        registry = Registry(str(tmp_path / "plugins.toml"))
+        registry.data["plugins"] = [plugin]
+        monkeypatch.setattr(registry, "save", Mock())
+        monkeypatch.setattr("registry_lib.cli.Registry", lambda path: registry)
+        return registry
+
+    return make_registry
+
+
+@pytest.mark.parametrize(
+    ("refs", "argv", "expected_out", "expected_refs"),
+    [
+        pytest.param(
+            None,
+            ["add", "test-plugin", "develop", "--description", "Dev branch", "--min-api-version", "4.0"],
+            ["Added ref: develop"],
+            [{"name": "develop", "description": "Dev branch", "min_api_version": "4.0"}],
+            id="add",
+        ),
+        pytest.param(
+            [{"name": "develop", "min_api_version": "4.0"}],
+            ["edit", "test-plugin", "develop", "--max-api-version", "4.99"],
+            ["Updated ref: develop"],
+            [{"name": "develop", "min_api_version": "4.0", "max_api_version": "4.99"}],
+            id="edit",
+        ),
+        pytest.param(
+            [{"name": "develop"}],
+            ["edit", "test-plugin", "develop", "--name", "beta"],
+            ["Updated ref: beta"],
+            [{"name": "beta"}],
+            id="rename",
+        ),
+        pytest.param(
             [
-                "registry",
-                "--registry",
-                str(registry_file),
-                "ref",
-                "add",
-                "test-plugin",
-                "develop",
-                "--description",
-                "Dev branch",
-                "--min-api-version",
-                "4.0",
-            ],
-        ):
-            main()
-
-        captured = capsys.readouterr()
-        assert "Added ref: develop" in captured.out
-
-        # Verify ref was added
-        data = tomllib.loads(registry_file.read_text())
-        plugin = data["plugins"][0]
-        assert "refs" in plugin
-        assert len(plugin["refs"]) == 1
-        assert plugin["refs"][0]["name"] == "develop"
-        assert plugin["refs"][0]["description"] == "Dev branch"
-        assert plugin["refs"][0]["min_api_version"] == "4.0"
-
-
-def test_cli_ref_edit(capsys):
-    """Test ref edit command."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        registry_file = Path(tmpdir) / "plugins.toml"
-        registry_data = {
-            "api_version": "3.0",
-            "plugins": [
-                {
-                    "id": "test-plugin",
-                    "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-                    "name": "Test Plugin",
-                    "description": "A test plugin",
-                    "git_url": "https://github.com/user/plugin",
-                    "categories": ["metadata"],
-                    "trust_level": "community",
-                    "authors": ["Test Author"],
-                    "added_at": "2025-01-01T00:00:00Z",
-                    "updated_at": "2025-01-01T00:00:00Z",
-                    "refs": [{"name": "develop", "min_api_version": "4.0"}],
-                }
+                {"name": "main", "description": "Main branch", "min_api_version": "4.0"},
+                {"name": "picard-v3", "description": "Picard 3.x", "min_api_version": "3.0", "max_api_version": "3.99"},
             ],
-            "blacklist": [],
-        }
-        registry_file.write_bytes(tomli_w.dumps(registry_data, indent=2).encode())
-
-        with patch(
-            "sys.argv",
+            ["list", "test-plugin"],
+            ["main - Main branch (API 4.0+)", "picard-v3 - Picard 3.x (API 3.0-3.99)"],
             [
-                "registry",
-                "--registry",
-                str(registry_file),
-                "ref",
-                "edit",
-                "test-plugin",
-                "develop",
-                "--max-api-version",
-                "4.99",
-            ],
-        ):
-            main()
-
-        captured = capsys.readouterr()
-        assert "Updated ref: develop" in captured.out
-
-        # Verify ref was updated
-        data = tomllib.loads(registry_file.read_text())
-        plugin = data["plugins"][0]
-        assert plugin["refs"][0]["max_api_version"] == "4.99"
-
-
-def test_cli_ref_rename(capsys):
-    """Test ref rename via edit command."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        registry_file = Path(tmpdir) / "plugins.toml"
-        registry_data = {
-            "api_version": "3.0",
-            "plugins": [
-                {
-                    "id": "test-plugin",
-                    "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-                    "name": "Test Plugin",
-                    "description": "A test plugin",
-                    "git_url": "https://github.com/user/plugin",
-                    "categories": ["metadata"],
-                    "trust_level": "community",
-                    "authors": ["Test Author"],
-                    "added_at": "2025-01-01T00:00:00Z",
-                    "updated_at": "2025-01-01T00:00:00Z",
-                    "refs": [{"name": "develop"}],
-                }
-            ],
-            "blacklist": [],
-        }
-        registry_file.write_bytes(tomli_w.dumps(registry_data, indent=2).encode())
-
-        with patch(
-            "sys.argv",
-            ["registry", "--registry", str(registry_file), "ref", "edit", "test-plugin", "develop", "--name", "beta"],
-        ):
-            main()
-
-        captured = capsys.readouterr()
-        assert "Updated ref: beta" in captured.out
-
-        # Verify ref was renamed
-        data = tomllib.loads(registry_file.read_text())
-        plugin = data["plugins"][0]
-        assert plugin["refs"][0]["name"] == "beta"
-
-
-def test_cli_ref_list(capsys):
-    """Test ref list command."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        registry_file = Path(tmpdir) / "plugins.toml"
-        registry_data = {
-            "api_version": "3.0",
-            "plugins": [
-                {
-                    "id": "test-plugin",
-                    "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-                    "name": "Test Plugin",
-                    "description": "A test plugin",
-                    "git_url": "https://github.com/user/plugin",
-                    "categories": ["metadata"],
-                    "trust_level": "community",
-                    "authors": ["Test Author"],
-                    "added_at": "2025-01-01T00:00:00Z",
-                    "updated_at": "2025-01-01T00:00:00Z",
-                    "refs": [
-                        {"name": "main", "description": "Main branch", "min_api_version": "4.0"},
-                        {
-                            "name": "picard-v3",
-                            "description": "Picard 3.x",
-                            "min_api_version": "3.0",
-                            "max_api_version": "3.99",
-                        },
-                    ],
-                }
-            ],
-            "blacklist": [],
-        }
-        registry_file.write_bytes(tomli_w.dumps(registry_data, indent=2).encode())
-
-        with patch("sys.argv", ["registry", "--registry", str(registry_file), "ref", "list", "test-plugin"]):
-            main()
-
-        captured = capsys.readouterr()
-        assert "main - Main branch (API 4.0+)" in captured.out
-        assert "picard-v3 - Picard 3.x (API 3.0-3.99)" in captured.out
-
-
-def test_cli_ref_list_no_refs(capsys):
-    """Test ref list command with no refs."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        registry_file = Path(tmpdir) / "plugins.toml"
-        registry_data = {
-            "api_version": "3.0",
-            "plugins": [
-                {
-                    "id": "test-plugin",
-                    "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-                    "name": "Test Plugin",
-                    "description": "A test plugin",
-                    "git_url": "https://github.com/user/plugin",
-                    "categories": ["metadata"],
-                    "trust_level": "community",
-                    "authors": ["Test Author"],
-                    "added_at": "2025-01-01T00:00:00Z",
-                    "updated_at": "2025-01-01T00:00:00Z",
-                }
+                {"name": "main", "description": "Main branch", "min_api_version": "4.0"},
+                {"name": "picard-v3", "description": "Picard 3.x", "min_api_version": "3.0", "max_api_version": "3.99"},
             ],
-            "blacklist": [],
-        }
-        registry_file.write_bytes(tomli_w.dumps(registry_data, indent=2).encode())
-
-        with patch("sys.argv", ["registry", "--registry", str(registry_file), "ref", "list", "test-plugin"]):
-            main()
-
-        captured = capsys.readouterr()
-        assert "No refs defined (using default: main)" in captured.out
-
-
-def test_cli_ref_remove(capsys):
-    """Test ref remove command."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        registry_file = Path(tmpdir) / "plugins.toml"
-        registry_data = {
-            "api_version": "3.0",
-            "plugins": [
-                {
-                    "id": "test-plugin",
-                    "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-                    "name": "Test Plugin",
-                    "description": "A test plugin",
-                    "git_url": "https://github.com/user/plugin",
-                    "categories": ["metadata"],
-                    "trust_level": "community",
-                    "authors": ["Test Author"],
-                    "added_at": "2025-01-01T00:00:00Z",
-                    "updated_at": "2025-01-01T00:00:00Z",
-                    "refs": [{"name": "develop"}],
-                }
-            ],
-            "blacklist": [],
-        }
-        registry_file.write_bytes(tomli_w.dumps(registry_data, indent=2).encode())
-
-        with patch(
-            "sys.argv", ["registry", "--registry", str(registry_file), "ref", "remove", "test-plugin", "develop"]
-        ):
-            main()
-
-        captured = capsys.readouterr()
-        assert "Removed ref: develop" in captured.out
-
-        # Verify ref was removed
-        data = tomllib.loads(registry_file.read_text())
-        plugin = data["plugins"][0]
-        assert "refs" not in plugin
+            id="list",
+        ),
+        pytest.param(
+            None,
+            ["list", "test-plugin"],
+            ["No refs defined (using default: main)"],
+            None,
+            id="list-no-refs",
+        ),
+        pytest.param(
+            [{"name": "develop"}],
+            ["remove", "test-plugin", "develop"],
+            ["Removed ref: develop"],
+            None,
+            id="remove",
+        ),
+    ],
+)
+def test_cli_ref_commands(cli_registry, capsys, refs, argv, expected_out, expected_refs, monkeypatch):
+    """Test ref commands print the expected output and update and save the refs."""
+    registry = cli_registry(refs=refs)
+
+    monkeypatch.setattr("sys.argv", ["registry", "ref", *argv])
+    main()
+
+    captured = capsys.readouterr()
+    for expected in expected_out:
+        assert expected in captured.out
+
+    plugin = registry.data["plugins"][0]
+    assert plugin.get("refs") == expected_refs
+    assert registry.save.called == (argv[0] != "list")
+
+
+def test_cli_ref_add_saved(tmp_path, monkeypatch):
+    """Test ref add command saves the registry file."""
+    registry_file = tmp_path / "plugins.toml"
+    registry = Registry(str(registry_file))
+    registry.add_plugin(copy.deepcopy(PLUGIN))
+    registry.save()
+
+    monkeypatch.setattr(
+        "sys.argv", ["registry", "--registry", str(registry_file), "ref", "add", "test-plugin", "develop"]
+    )
+    main()
+
+    plugin = Registry(str(registry_file)).data["plugins"][0]
+    assert plugin["refs"] == [{"name": "develop"}]
+    assert plugin["updated_at"] != "2025-01-01T00:00:00Z"
+
+
+def test_cli_ref_add_existing(cli_registry, capsys, monkeypatch):
+    """Test ref add command with an existing ref name."""
+    cli_registry(refs=[{"name": "develop"}])
+
+    monkeypatch.setattr("sys.argv", ["registry", "ref", "add", "test-plugin", "develop"])
+    with pytest.raises(SystemExit):
+        main()
+
+    captured = capsys.readouterr()
+    assert "Ref develop already exists" in captured.err
+
+
+def test_cli_ref_rename_existing(cli_registry, capsys, monkeypatch):
+    """Test ref rename via edit command to an existing ref name."""
+    registry = cli_registry(refs=[{"name": "develop"}, {"name": "beta"}])
+
+    monkeypatch.setattr("sys.argv", ["registry", "ref", "edit", "test-plugin", "develop", "--name", "beta"])
+    with pytest.raises(SystemExit):
+        main()
+
+    captured = capsys.readouterr()
+    assert "Ref beta already exists" in captured.err
+
+    # Verify refs were not changed
+    plugin = registry.data["plugins"][0]
+    assert [r["name"] for r in plugin["refs"]] == ["develop", "beta"]
@@ -1,5 +1,6 @@
 """Tests for manifest module."""
 
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
 from unittest.mock import (
     Mock,
@@ -10,9 +11,13 @@ from unittest.mock import (
 import pytest
 
 from registry_lib.manifest import (
+    _MANIFEST_CACHE_SIZE,
     GitOperationError,
+    ManifestValidationError,
     _fetch_file_git_cli,
     _fetch_file_pygit2,
+    _session,
+    _valid_manifests,
     fetch_file_via_clone,
     fetch_manifest,
     raw_url,
@@ -20,18 +25,19 @@ from registry_lib.manifest import (
 )
 
 
-@patch("registry_lib.manifest.requests.get")
-def test_fetch_manifest_success(mock_get):
-    """Test successful manifest fetch."""
-    mock_response = Mock()
-    mock_response.text = """
+MANIFEST_TEXT = """\
 uuid = "6de6a3bf-a524-42b6-83cb-a36b2ec2e246"
 name = "Test Plugin"
 version = "1.0.0"
 description = "A test plugin"
 api = ["3.0"]
 """
-    mock_get.return_value = mock_response
+
+
+@patch("registry_lib.manifest.requests.Session.get")
+def test_fetch_manifest_success(mock_get):
+    """Test successful manifest fetch."""
+    mock_get.return_value = Mock(text=MANIFEST_TEXT)
 
     manifest = fetch_manifest("https://github.com/user/plugin", "main")
 
@@ -40,19 +46,36 @@ api = ["3.0"]
     mock_get.assert_called_once()
 
 
-@patch("registry_lib.manifest.requests.get")
-def test_fetch_manifest_with_git_suffix(mock_get):
-    """Test manifest fetch with .git suffix."""
+@patch("registry_lib.manifest.requests.Session.get")
+def test_fetch_manifest_cached(mock_get):
+    """Test repeated manifest fetches are served from the cache."""
     mock_response = Mock()
-    mock_response.text = """
-uuid = "6de6a3bf-a524-42b6-83cb-a36b2ec2e246"
-name = "Test Plugin"
-version = "1.0.0"
-description = "A test plugin"
-api = ["3.0"]
-"""
+    mock_response.text = 'uuid = "6de6a3bf-a524-42b6-83cb-a36b2ec2e246"\nname = "Test Plugin"\n'
     mock_get.return_value = mock_response
 
+    first = fetch_manifest("https://github.com/user/plugin", "main")
+    first["name"] = "Changed"
+    second = fetch_manifest("https://github.com/user/plugin", "main")
+    fetch_manifest("https://github.com/user/plugin", "v2")
+
+    assert second["name"] == "Test Plugin"
+    assert mock_get.call_count == 2
+
+
+def test_session_per_thread():
+    """Test the HTTP session is reused within a thread but not shared between threads."""
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        other = executor.submit(_session).result()
+
+    assert _session() is _session()
+    assert other is not _session()
+
+
+@patch("registry_lib.manifest.requests.Session.get")
+def test_fetch_manifest_with_git_suffix(mock_get):
+    """Test manifest fetch with .git suffix."""
+    mock_get.return_value = Mock(text=MANIFEST_TEXT)
+
     fetch_manifest("https://github.com/user/plugin.git", "main")
 
     # Should strip .git suffix from repo name
@@ -71,18 +94,10 @@ api = ["3.0"]
         ("https://bitbucket.org/user/plugin", "bitbucket.org/user/plugin/raw/main/MANIFEST.toml"),
     ],
 )
-@patch("registry_lib.manifest.requests.get")
+@patch("registry_lib.manifest.requests.Session.get")
 def test_fetch_manifest_supported(mock_get, repo_url, expected_manifest_url):
     """Test successful manifest fetch from GitLab."""
-    mock_response = Mock()
-    mock_response.text = """
-uuid = "6de6a3bf-a524-42b6-83cb-a36b2ec2e246"
-name = "Test Plugin"
-version = "1.0.0"
-description = "A test plugin"
-api = ["3.0"]
-"""
-    mock_get.return_value = mock_response
+    mock_get.return_value = Mock(text=MANIFEST_TEXT)
 
     manifest = fetch_manifest(repo_url, "main")
 
@@ -93,14 +108,7 @@ api = ["3.0"]
 
 def test_fetch_manifest_unsupported_falls_back_to_clone():
     """Test fetch manifest falls back to clone for unknown hosts."""
-    manifest_toml = """\
-uuid = "6de6a3bf-a524-42b6-83cb-a36b2ec2e246"
-name = "Test Plugin"
-version = "1.0.0"
-description = "A test plugin"
-api = ["3.0"]
-"""
-    with patch("registry_lib.manifest.fetch_file_via_clone", return_value=manifest_toml) as mock_clone:
+    with patch("registry_lib.manifest.fetch_file_via_clone", return_value=MANIFEST_TEXT) as mock_clone:
         manifest = fetch_manifest("https://unknown.example.com/user/plugin", "main")
 
     assert manifest["name"] == "Test Plugin"
@@ -250,5 +258,46 @@ def test_validate_manifest_invalid():
         "uuid": "invalid-uuid",
         "name": "Test Plugin",
     }
-    with pytest.raises(ValueError, match="Manifest validation failed"):
+    with pytest.raises(ManifestValidationError):
+        validate_manifest(manifest)
+
+
+@patch("registry_lib.manifest.validate_manifest_dict", return_value=[])
+def test_validate_manifest_cached(mock_validate):
+    """Test validating the same manifest content again is skipped."""
+    manifest = {
+        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
+        "name": "Test Plugin",
+        "description": "A test plugin",
+        "api": ["3.0"],
+    }
+    validate_manifest(manifest)
+    validate_manifest(dict(manifest))
+    assert mock_validate.call_count == 1
+
+    validate_manifest({**manifest, "api": ["4.0"]})
+    assert mock_validate.call_count == 2
+
+
+@patch("registry_lib.manifest.validate_manifest_dict", return_value=[])
+def test_validate_manifest_cache_bounded(mock_validate):
+    """Test the least recently validated manifests are dropped from the cache."""
+    manifests = [{"uuid": str(i)} for i in range(_MANIFEST_CACHE_SIZE + 1)]
+    for manifest in manifests:
         validate_manifest(manifest)
+    assert len(_valid_manifests) == _MANIFEST_CACHE_SIZE
+
+    validate_manifest(manifests[-1])
+    assert mock_validate.call_count == _MANIFEST_CACHE_SIZE + 1
+    validate_manifest(manifests[0])
+    assert mock_validate.call_count == _MANIFEST_CACHE_SIZE + 2
+
+
+@patch("registry_lib.manifest.validate_manifest_dict", return_value=["Missing required field: name"])
+def test_validate_manifest_invalid_not_cached(mock_validate):
+    """Test invalid manifests are validated every time."""
+    manifest = {"uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246"}
+    for _ in range(2):
+        with pytest.raises(ManifestValidationError, match="Missing required field"):
+            validate_manifest(manifest)
+    assert mock_validate.call_count == 2
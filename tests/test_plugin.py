@@ -4,30 +4,24 @@ from unittest.mock import patch
 
 import pytest
 
+from registry_lib.manifest import ManifestValidationError
 from registry_lib.plugin import (
+    DuplicateIDError,
+    DuplicateURLError,
+    DuplicateUUIDError,
+    InvalidTrustLevelError,
+    UUIDMismatchError,
     add_plugin,
     update_plugin,
+    update_plugins,
 )
 from registry_lib.registry import Registry
+from tests.manifests import MANIFEST
 
 
-@pytest.fixture
-def temp_registry(tmp_path):
-    """Create temporary registry."""
-    return Registry(str(tmp_path / "plugins.toml"))
-
-
-@patch("registry_lib.plugin.fetch_manifest")
 def test_add_plugin_basic(mock_fetch, temp_registry):
     """Test adding a basic plugin."""
-    mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
-        "version": "1.0.0",
-        "description": "A test plugin",
-        "api": ["3.0"],
-        "authors": ["Test Author"],
-    }
+    mock_fetch.return_value = {**MANIFEST, "authors": ["Test Author"]}
 
     plugin = add_plugin(temp_registry, "https://github.com/user/test-plugin", "community")
 
@@ -40,226 +34,128 @@ def test_add_plugin_basic(mock_fetch, temp_registry):
     assert "updated_at" in plugin
 
 
-@patch("registry_lib.plugin.fetch_manifest")
-def test_add_plugin_with_categories(mock_fetch, temp_registry):
-    """Test adding plugin with custom categories."""
-    mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
-        "version": "1.0.0",
-        "description": "A test plugin",
-        "api": ["3.0"],
-    }
-
-    plugin = add_plugin(
-        temp_registry, "https://github.com/user/test-plugin", "community", categories=["metadata", "coverart"]
-    )
-
-    assert plugin["categories"] == ["metadata", "coverart"]
-
-
-@patch("registry_lib.plugin.fetch_manifest")
-def test_add_plugin_with_i18n(mock_fetch, temp_registry):
-    """Test adding plugin with translations."""
-    mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
-        "version": "1.0.0",
-        "description": "A test plugin",
-        "api": ["3.0"],
-        "name_i18n": {"de": "Test Plugin DE"},
-        "description_i18n": {"de": "Ein Test Plugin"},
-    }
-
-    plugin = add_plugin(temp_registry, "https://github.com/user/test-plugin", "community")
-
-    assert plugin["name_i18n"] == {"de": "Test Plugin DE"}
-    assert plugin["description_i18n"] == {"de": "Ein Test Plugin"}
-
-
-@patch("registry_lib.plugin.fetch_manifest")
-def test_add_plugin_with_report_bugs_to(mock_fetch, temp_registry):
-    """Test adding plugin with report_bugs_to."""
-    mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
-        "version": "1.0.0",
-        "description": "A test plugin",
-        "api": ["3.0"],
-        "report_bugs_to": "https://github.com/user/test-plugin/issues",
-    }
-
-    plugin = add_plugin(temp_registry, "https://github.com/user/test-plugin", "community")
-
-    assert plugin["report_bugs_to"] == "https://github.com/user/test-plugin/issues"
-
-
-@patch("registry_lib.plugin.fetch_manifest")
-def test_add_plugin_with_optional_url_fields(mock_fetch, temp_registry):
-    """Test adding plugin with license, license_url, and homepage."""
-    mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
-        "version": "1.0.0",
-        "description": "A test plugin",
-        "api": ["3.0"],
-        "license": "GPL-2.0-or-later",
-        "license_url": "https://www.gnu.org/licenses/gpl-2.0.html",
-        "homepage": "https://example.com/test-plugin",
-    }
-
-    plugin = add_plugin(temp_registry, "https://github.com/user/test-plugin", "community")
-
-    assert plugin["license"] == "GPL-2.0-or-later"
-    assert plugin["license_url"] == "https://www.gnu.org/licenses/gpl-2.0.html"
-    assert plugin["homepage"] == "https://example.com/test-plugin"
-
-
-@patch("registry_lib.plugin.fetch_manifest")
-def test_add_plugin_with_long_description(mock_fetch, temp_registry):
-    """Test adding plugin with long_description and long_description_i18n."""
-    mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
-        "version": "1.0.0",
-        "description": "A test plugin",
-        "api": ["3.0"],
-        "long_description": "This is a longer description of the plugin.",
-        "long_description_i18n": {"de": "Dies ist eine längere Beschreibung."},
-    }
-
-    plugin = add_plugin(temp_registry, "https://github.com/user/test-plugin", "community")
-
-    assert plugin["long_description"] == "This is a longer description of the plugin."
-    assert plugin["long_description_i18n"] == {"de": "Dies ist eine längere Beschreibung."}
-
-
-@patch("registry_lib.plugin.fetch_manifest")
-def test_add_plugin_with_multi_refs(mock_fetch, temp_registry):
-    """Test adding plugin with multiple refs."""
-    mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
-        "version": "1.0.0",
-        "description": "A test plugin",
-        "api": ["3.0"],
-    }
+def test_add_and_update_plugin_with_timestamp(mock_fetch, temp_registry):
+    """Test adding and updating a plugin with a given timestamp."""
+    plugin = add_plugin(temp_registry, "https://github.com/user/test-plugin", "community", now="2025-01-01T00:00:00Z")
+    assert plugin["added_at"] == "2025-01-01T00:00:00Z"
+    assert plugin["updated_at"] == "2025-01-01T00:00:00Z"
+
+    plugin = update_plugin(temp_registry, "test-plugin", now="2025-02-01T00:00:00Z")
+    assert plugin["added_at"] == "2025-01-01T00:00:00Z"
+    assert plugin["updated_at"] == "2025-02-01T00:00:00Z"
+
+
+@pytest.mark.parametrize(
+    ("fields", "kwargs", "expected"),
+    [
+        pytest.param(
+            {},
+            {"categories": ["metadata", "coverart"]},
+            {"categories": ["metadata", "coverart"]},
+            id="categories",
+        ),
+        pytest.param(
+            {"name_i18n": {"de": "Test Plugin DE"}, "description_i18n": {"de": "Ein Test Plugin"}},
+            {},
+            {},
+            id="i18n",
+        ),
+        pytest.param(
+            {"report_bugs_to": "https://github.com/user/test-plugin/issues"},
+            {},
+            {},
+            id="report-bugs-to",
+        ),
+        pytest.param(
+            {
+                "license": "GPL-2.0-or-later",
+                "license_url": "https://www.gnu.org/licenses/gpl-2.0.html",
+                "homepage": "https://example.com/test-plugin",
+            },
+            {},
+            {},
+            id="optional-url-fields",
+        ),
+        pytest.param(
+            {
+                "long_description": "This is a longer description of the plugin.",
+                "long_description_i18n": {"de": "Dies ist eine längere Beschreibung."},
+            },
+            {},
+            {},
+            id="long-description",
+        ),
+        pytest.param(
+            {},
+            {"refs": "main:4.0,picard-v3:3.0-3.99"},
+            {
+                "refs": [
+                    {"name": "main", "min_api_version": "4.0"},
+                    {"name": "picard-v3", "min_api_version": "3.0", "max_api_version": "3.99"},
+                ]
+            },
+            id="multi-refs",
+        ),
+    ],
+)
+def test_add_plugin_with_options(mock_fetch, temp_registry, fields, kwargs, expected):
+    """Test adding plugin with optional manifest fields and options."""
+    mock_fetch.return_value = {**MANIFEST, **fields}
 
-    plugin = add_plugin(
-        temp_registry, "https://github.com/user/test-plugin", "community", refs="main:4.0,picard-v3:3.0-3.99"
-    )
+    plugin = add_plugin(temp_registry, "https://github.com/user/test-plugin", "community", **kwargs)
 
-    assert "refs" in plugin
-    assert len(plugin["refs"]) == 2
-    assert plugin["refs"][0] == {"name": "main", "min_api_version": "4.0"}
-    assert plugin["refs"][1] == {"name": "picard-v3", "min_api_version": "3.0", "max_api_version": "3.99"}
+    for key, value in {**fields, **expected}.items():
+        assert plugin[key] == value
 
 
-@patch("registry_lib.plugin.fetch_manifest")
 def test_add_plugin_invalid_trust_level(mock_fetch, temp_registry):
     """Test adding plugin with invalid trust level."""
-    mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
-        "version": "1.0.0",
-        "description": "A test plugin",
-        "api": ["3.0"],
-    }
-
-    with pytest.raises(ValueError, match="Invalid trust level"):
+    with pytest.raises(InvalidTrustLevelError):
         add_plugin(temp_registry, "https://github.com/user/test-plugin", "invalid")
 
 
-@patch("registry_lib.plugin.fetch_manifest")
 def test_add_plugin_duplicate(mock_fetch, temp_registry):
     """Test adding duplicate plugin by URL."""
-    mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
-        "version": "1.0.0",
-        "description": "A test plugin",
-        "api": ["3.0"],
-    }
-
     add_plugin(temp_registry, "https://github.com/user/test-plugin", "community")
 
-    with pytest.raises(ValueError, match="Plugin with git URL.*already exists"):
+    with pytest.raises(DuplicateURLError):
         add_plugin(temp_registry, "https://github.com/user/test-plugin", "community")
 
 
-@patch("registry_lib.plugin.fetch_manifest")
 def test_add_plugin_duplicate_uuid(mock_fetch, temp_registry):
     """Test adding plugin with duplicate UUID."""
-    mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
-        "version": "1.0.0",
-        "description": "A test plugin",
-        "api": ["3.0"],
-    }
-
     add_plugin(temp_registry, "https://github.com/user/test-plugin", "community")
 
     # Try to add different plugin with same UUID
-    mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Another Plugin",
-        "version": "1.0.0",
-        "description": "Another plugin",
-        "api": ["3.0"],
-    }
+    mock_fetch.return_value = {**MANIFEST, "name": "Another Plugin", "description": "Another plugin"}
 
-    with pytest.raises(ValueError, match="Plugin with UUID.*already exists"):
+    with pytest.raises(DuplicateUUIDError):
         add_plugin(temp_registry, "https://github.com/user/another-plugin", "community")
 
 
-@patch("registry_lib.plugin.fetch_manifest")
 def test_add_plugin_duplicate_id(mock_fetch, temp_registry):
     """Test adding plugin with duplicate ID (derived from URL)."""
-    mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
-        "version": "1.0.0",
-        "description": "A test plugin",
-        "api": ["3.0"],
-    }
-
     add_plugin(temp_registry, "https://github.com/user/test-plugin", "community")
 
     # Try to add with different UUID but same derived ID (same URL base)
-    mock_fetch.return_value = {
-        "uuid": "f47ac10b-58cc-4372-a567-0e02b2c3d479",
-        "name": "Test Plugin",
-        "version": "1.0.0",
-        "description": "A test plugin",
-        "api": ["3.0"],
-    }
+    mock_fetch.return_value = {**MANIFEST, "uuid": "f47ac10b-58cc-4372-a567-0e02b2c3d479"}
 
-    with pytest.raises(ValueError, match="Plugin with ID.*already exists"):
+    with pytest.raises(DuplicateIDError):
         add_plugin(temp_registry, "https://github.com/user/test-plugin.git", "community")
 
 
-@patch("registry_lib.plugin.fetch_manifest")
 def test_update_plugin(mock_fetch, temp_registry):
     """Test updating plugin metadata."""
     # Add plugin first
-    mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
-        "version": "1.0.0",
-        "description": "Old description",
-        "api": ["3.0"],
-        "authors": ["Old Author"],
-    }
+    mock_fetch.return_value = {**MANIFEST, "description": "Old description", "authors": ["Old Author"]}
     add_plugin(temp_registry, "https://github.com/user/test-plugin", "community")
 
     # Update with new manifest
     mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
+        **MANIFEST,
         "name": "Test Plugin Updated",
         "version": "2.0.0",
         "description": "New description",
-        "api": ["3.0"],
         "authors": ["New Author"],
     }
 
@@ -271,18 +167,10 @@ def test_update_plugin(mock_fetch, temp_registry):
     mock_fetch.assert_called_with("https://github.com/user/test-plugin", "main")
 
 
-@patch("registry_lib.plugin.fetch_manifest")
 def test_update_plugin_custom_ref(mock_fetch, temp_registry):
     """Test updating plugin metadata."""
     # Add plugin first
-    mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
-        "version": "1.0.0",
-        "description": "Old description",
-        "api": ["3.0"],
-        "authors": ["Old Author"],
-    }
+    mock_fetch.return_value = {**MANIFEST, "description": "Old description", "authors": ["Old Author"]}
     add_plugin(temp_registry, "https://github.com/user/test-plugin", "community", refs="v1:3.0,master")
 
     update_plugin(temp_registry, "test-plugin")
@@ -290,82 +178,47 @@ def test_update_plugin_custom_ref(mock_fetch, temp_registry):
     mock_fetch.assert_called_with("https://github.com/user/test-plugin", "v1")
 
 
-@patch("registry_lib.plugin.fetch_manifest")
 def test_update_plugin_report_bugs_to(mock_fetch, temp_registry):
     """Test that report_bugs_to is synced on update."""
-    mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
-        "version": "1.0.0",
-        "description": "A test plugin",
-        "api": ["3.0"],
-    }
     add_plugin(temp_registry, "https://github.com/user/test-plugin", "community")
 
     # Update adds report_bugs_to
     mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
+        **MANIFEST,
         "version": "1.1.0",
-        "description": "A test plugin",
-        "api": ["3.0"],
         "report_bugs_to": "https://github.com/user/test-plugin/issues",
     }
     plugin = update_plugin(temp_registry, "test-plugin")
     assert plugin["report_bugs_to"] == "https://github.com/user/test-plugin/issues"
 
     # Update removes report_bugs_to
-    mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
-        "version": "1.2.0",
-        "description": "A test plugin",
-        "api": ["3.0"],
-    }
+    mock_fetch.return_value = {**MANIFEST, "version": "1.2.0"}
     plugin = update_plugin(temp_registry, "test-plugin")
     assert "report_bugs_to" not in plugin
 
 
-@patch("registry_lib.plugin.fetch_manifest")
 def test_update_plugin_uuid_changed(mock_fetch, temp_registry):
     """Test that updating plugin with changed UUID raises error."""
     # Add plugin first
-    mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
-        "version": "1.0.0",
-        "description": "Test description",
-        "api": ["3.0"],
-        "authors": ["Test Author"],
-    }
+    mock_fetch.return_value = {**MANIFEST, "description": "Test description", "authors": ["Test Author"]}
     add_plugin(temp_registry, "https://github.com/user/test-plugin", "community")
 
     # Try to update with different UUID
     mock_fetch.return_value = {
+        **MANIFEST,
         "uuid": "f47ac10b-58cc-4372-a567-0e02b2c3d479",
-        "name": "Test Plugin",
-        "version": "1.0.0",
         "description": "Test description",
-        "api": ["3.0"],
         "authors": ["Test Author"],
     }
 
-    with pytest.raises(ValueError, match="UUID mismatch.*UUIDs must not change"):
+    with pytest.raises(UUIDMismatchError):
         update_plugin(temp_registry, "test-plugin")
 
 
-@patch("registry_lib.plugin.fetch_manifest")
 def test_update_plugin_invalid_manifest(mock_fetch, temp_registry):
     """Test that updating plugin with invalid manifest raises error."""
     # Add plugin first
-    mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
-        "version": "1.0.0",
-        "description": "Test description",
-        "api": ["3.0"],
-        "authors": ["Test Author"],
-    }
+    mock_fetch.return_value = {**MANIFEST, "description": "Test description", "authors": ["Test Author"]}
     add_plugin(temp_registry, "https://github.com/user/test-plugin", "community")
 
     # Try to update with invalid manifest (missing required field)
@@ -376,36 +229,106 @@ def test_update_plugin_invalid_manifest(mock_fetch, temp_registry):
         "api": ["3.0"],
     }
 
-    with pytest.raises(ValueError, match="Manifest validation failed.*Missing required field: name"):
+    with pytest.raises(ManifestValidationError, match="Missing required field: name"):
         update_plugin(temp_registry, "test-plugin")
 
 
 @patch("registry_lib.picard.validator.render_markdown")
-@patch("registry_lib.plugin.fetch_manifest")
-def test_update_plugin_long_description_with_html(mock_fetch, mock_render_markdown, temp_registry):
+def test_update_plugin_long_description_with_html(mock_render_markdown, mock_fetch, temp_registry):
     """Test that updating plugin with HTML in long_description raises error and calls render_markdown."""
     # Add plugin first
-    mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
-        "version": "1.0.0",
-        "description": "Test description",
-        "api": ["3.0"],
-    }
+    mock_fetch.return_value = {**MANIFEST, "description": "Test description"}
     add_plugin(temp_registry, "https://github.com/user/test-plugin", "community")
 
     # Try to update with HTML in long_description
     mock_fetch.return_value = {
-        "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
-        "name": "Test Plugin",
+        **MANIFEST,
         "description": "Test description",
-        "api": ["3.0"],
         "long_description": "This is a <b>bold</b> description with HTML tags",
     }
 
-    with pytest.raises(ValueError, match="Manifest validation failed.*contains HTML tags"):
+    with pytest.raises(ManifestValidationError, match="contains HTML tags"):
         update_plugin(temp_registry, "test-plugin")
 
     mock_render_markdown.assert_called_once_with(
         "This is a <b>bold</b> description with HTML tags", output_format='html'
     )
+
+
+def test_update_plugins(mock_fetch, temp_registry):
+    """Test updating several plugins, collecting errors per plugin."""
+    manifests = {
+        "https://github.com/user/alpha": {
+            "uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246",
+            "name": "Plugin A",
+            "description": "First plugin",
+            "api": ["3.0"],
+        },
+        "https://github.com/user/beta": {
+            "uuid": "f47ac10b-58cc-4372-a567-0e02b2c3d479",
+            "name": "Plugin B",
+            "description": "Second plugin",
+            "api": ["3.0"],
+        },
+    }
+    mock_fetch.side_effect = lambda git_url, ref: dict(manifests[git_url])
+    add_plugin(temp_registry, "https://github.com/user/alpha", "community")
+    add_plugin(temp_registry, "https://github.com/user/beta", "community", refs="v2")
+
+    manifests["https://github.com/user/alpha"]["name"] = "Plugin A2"
+    manifests["https://github.com/user/beta"]["uuid"] = "9a1c6b2e-3f4d-4e5a-8b7c-2d1e0f3a4b5c"
+    mock_fetch.reset_mock()
+
+    updated, errors = update_plugins(temp_registry)
+
+    assert [p["id"] for p in updated] == ["alpha"]
+    assert temp_registry.find_plugin("alpha")["name"] == "Plugin A2"
+    assert list(errors) == ["beta"]
+    assert isinstance(errors["beta"], UUIDMismatchError)
+    assert temp_registry.find_plugin("beta")["name"] == "Plugin B"
+    mock_fetch.assert_any_call("https://github.com/user/alpha", "main")
+    mock_fetch.assert_any_call("https://github.com/user/beta", "v2")
+
+
+def test_update_plugins_not_found(mock_fetch, temp_registry):
+    """Test updating unknown plugins reports an error."""
+    updated, errors = update_plugins(temp_registry, ["nonexistent"])
+
+    assert updated == []
+    assert "not found" in str(errors["nonexistent"])
+    mock_fetch.assert_not_called()
+
+
+def test_update_plugins_saved(mock_fetch, tmp_path):
+    """Test plugins updated in a file-backed registry are written by save()."""
+    registry_path = tmp_path / "plugins.toml"
+    registry = Registry(str(registry_path))
+    add_plugin(registry, "https://github.com/user/plugin", "community")
+    registry.save()
+
+    mock_fetch.return_value = {**MANIFEST, "name": "Renamed Plugin"}
+    updated, errors = update_plugins(registry)
+    registry.save()
+
+    assert [p["id"] for p in updated] == ["plugin"]
+    assert errors == {}
+    assert Registry(str(registry_path)).data["plugins"][0]["name"] == "Renamed Plugin"
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        pytest.param(lambda registry: None, id="add"),
+        pytest.param(lambda registry: update_plugin(registry, "plugin"), id="update"),
+        pytest.param(update_plugins, id="update-all"),
+    ],
+)
+@pytest.mark.parametrize("field", ["description", "license"])
+def test_plugin_whitespace_warning_location(mock_fetch, temp_registry, operation, field):
+    """Test whitespace warnings point at the caller of the public function."""
+    mock_fetch.return_value = {**MANIFEST, field: " padded "}
+    with pytest.warns(UserWarning, match=f"field '{field}' has leading/trailing whitespace") as record:
+        add_plugin(temp_registry, "https://github.com/user/plugin", "community")
+        operation(temp_registry)
+
+    assert [warning.filename for warning in record] == [__file__] * len(record)
@@ -1,17 +1,12 @@
 """Tests for registry module."""
 
+from unittest.mock import patch
+
 import pytest
 
 from registry_lib.registry import Registry
 
 
-@pytest.fixture
-def temp_registry(tmp_path):
-    """Create temporary registry."""
-    registry_path = tmp_path / "plugins.toml"
-    return Registry(str(registry_path))
-
-
 def test_registry_init_new(temp_registry):
     """Test creating new registry."""
     assert temp_registry.data["api_version"] == "3.0"
@@ -43,6 +38,44 @@ def test_registry_save_and_load(tmp_path):
     assert content.endswith("\n")
 
 
+def test_registry_save_new(tmp_path):
+    """Test saving a new registry creates the file."""
+    registry_path = tmp_path / "plugins.toml"
+    Registry(str(registry_path)).save()
+
+    assert 'api_version = "3.0"' in registry_path.read_text()
+
+
+def test_registry_save_unchanged(tmp_path):
+    """Test saving an unchanged registry does not rewrite the file."""
+    registry_path = tmp_path / "plugins.toml"
+    registry = Registry(str(registry_path))
+    registry.add_plugin({"id": "test-plugin", "name": "Test"})
+    registry.save()
+
+    registry = Registry(str(registry_path))
+    with patch("registry_lib.registry.os.replace") as mock_replace:
+        registry.save()
+        registry.remove_plugin("nonexistent")
+        registry.remove_blacklist(url="https://github.com/none/plugin")
+        registry.save()
+
+    mock_replace.assert_not_called()
+
+
+def test_registry_save_edited_in_place(tmp_path):
+    """Test saving writes entries that were modified in place."""
+    registry_path = tmp_path / "plugins.toml"
+    registry = Registry(str(registry_path))
+    registry.add_plugin({"id": "test-plugin", "name": "Test"})
+    registry.save()
+
+    registry.data["plugins"][0]["name"] = "Changed"
+    registry.save()
+
+    assert Registry(str(registry_path)).data["plugins"][0]["name"] == "Changed"
+
+
 def test_find_plugin(temp_registry):
     """Test finding plugin by ID."""
     plugin = {"id": "test-plugin", "name": "Test"}
@@ -56,6 +89,103 @@ def test_find_plugin(temp_registry):
     assert not_found is None
 
 
+def test_registry_transaction(tmp_path):
+    """Test saves inside a transaction are deferred until it ends."""
+    registry_path = tmp_path / "plugins.toml"
+    registry = Registry(str(registry_path))
+
+    with registry.transaction():
+        registry.add_plugin({"id": "first", "name": "First"})
+        registry.save()
+        assert not registry_path.exists()
+        with registry.transaction():
+            registry.add_plugin({"id": "second", "name": "Second"})
+        assert not registry_path.exists()
+
+    assert [p["id"] for p in Registry(str(registry_path)).data["plugins"]] == ["first", "second"]
+
+
+def test_registry_transaction_error(tmp_path):
+    """Test a transaction ending with an exception does not save."""
+    registry_path = tmp_path / "plugins.toml"
+    registry = Registry(str(registry_path))
+
+    with pytest.raises(RuntimeError), registry.transaction():
+        registry.add_plugin({"id": "first", "name": "First"})
+        raise RuntimeError("failed")
+
+    assert not registry_path.exists()
+    registry.save()
+    assert registry_path.exists()
+
+
+def test_registry_save_replaces_file(tmp_path):
+    """Test saving replaces the file, keeping its permissions and no temporary files."""
+    registry_path = tmp_path / "plugins.toml"
+    registry_path.write_text('api_version = "3.0"\n\n[[plugins]]\nid = "old"\n')
+    registry_path.chmod(0o640)
+    registry = Registry(str(registry_path))
+
+    registry.add_plugin({"id": "new", "name": "New"})
+    registry.save()
+
+    assert [p.name for p in tmp_path.iterdir()] == ["plugins.toml"]
+    assert registry_path.stat().st_mode & 0o777 == 0o640
+    assert [p["id"] for p in Registry(str(registry_path)).data["plugins"]] == ["new", "old"]
+
+
+def test_registry_save_error_keeps_file(tmp_path):
+    """Test a failing save leaves the existing file untouched."""
+    registry_path = tmp_path / "plugins.toml"
+    content = 'api_version = "3.0"\n\n[[plugins]]\nid = "old"\n'
+    registry_path.write_text(content)
+    registry = Registry(str(registry_path))
+    registry.add_plugin({"id": "new", "name": "New"})
+
+    with patch("registry_lib.registry.os.fsync", side_effect=OSError("disk full")), pytest.raises(OSError):
+        registry.save()
+
+    assert registry_path.read_text() == content
+    assert [p.name for p in tmp_path.iterdir()] == ["plugins.toml"]
+
+
+def test_find_plugin_after_changes(temp_registry):
+    """Test finding plugin stays correct after adding and removing plugins."""
+    temp_registry.add_plugin({"id": "first", "name": "First"})
+    assert temp_registry.find_plugin("first") is not None
+
+    temp_registry.add_plugin({"id": "second", "name": "Second"})
+    found = temp_registry.find_plugin("second")
+    assert found is not None
+    assert found["name"] == "Second"
+
+    temp_registry.remove_plugin("first")
+    assert temp_registry.find_plugin("first") is None
+    assert temp_registry.find_plugin("second") is not None
+
+
+def test_find_plugin_by_uuid_and_url(temp_registry):
+    """Test finding plugin by UUID and git URL."""
+    plugin = {"id": "test-plugin", "uuid": "uuid-1", "git_url": "https://github.com/user/plugin"}
+    temp_registry.add_plugin(plugin)
+    assert temp_registry.find_plugin_by_uuid("uuid-1") is plugin
+    assert temp_registry.find_plugin_by_url("https://github.com/user/plugin") is plugin
+    assert temp_registry.find_plugin_by_uuid("uuid-2") is None
+
+    other = {"id": "other", "uuid": "uuid-2", "git_url": "https://github.com/user/other"}
+    temp_registry.add_plugin(other)
+    assert temp_registry.find_plugin_by_uuid("uuid-2") is other
+
+    plugin["git_url"] = "https://github.com/new/plugin"
+    temp_registry.mark_changed()
+    assert temp_registry.find_plugin_by_url("https://github.com/user/plugin") is None
+    assert temp_registry.find_plugin_by_url("https://github.com/new/plugin") is plugin
+
+    temp_registry.remove_plugin("test-plugin")
+    assert temp_registry.find_plugin_by_uuid("uuid-1") is None
+    assert temp_registry.find_plugin_by_url("https://github.com/new/plugin") is None
+
+
 def test_remove_plugin(temp_registry):
     """Test removing plugin."""
     plugin = {"id": "test-plugin", "name": "Test"}
@@ -66,6 +196,20 @@ def test_remove_plugin(temp_registry):
     assert len(temp_registry.data["plugins"]) == 0
 
 
+def test_remove_plugin_duplicate_id(temp_registry):
+    """Test removing plugin removes all entries with that ID."""
+    temp_registry.add_plugin({"id": "test-plugin", "name": "First"})
+    temp_registry.add_plugin({"id": "other", "name": "Other"})
+    temp_registry.add_plugin({"id": "test-plugin", "name": "Second"})
+    assert temp_registry.find_plugin("test-plugin")["name"] == "First"
+
+    plugins = temp_registry.data["plugins"]
+    temp_registry.remove_plugin("test-plugin")
+    assert [p["id"] for p in plugins] == ["other"]
+    assert temp_registry.data["plugins"] is plugins
+    assert temp_registry.find_plugin("test-plugin") is None
+
+
 def test_add_blacklist(temp_registry):
     """Test adding blacklist entry."""
     entry = {"url": "https://github.com/bad/plugin", "reason": "Malicious"}
@@ -85,6 +229,25 @@ def test_remove_blacklist(temp_registry):
     assert len(temp_registry.data["blacklist"]) == 0
 
 
+def test_find_blacklist(temp_registry):
+    """Test finding blacklist entry by URL or UUID."""
+    temp_registry.add_blacklist({"url": "https://github.com/bad/plugin", "reason": "Malicious"})
+    temp_registry.add_blacklist({"uuid": "6de6a3bf-a524-42b6-83cb-a36b2ec2e246", "reason": "Broken"})
+
+    found = temp_registry.find_blacklist(url="https://github.com/bad/plugin")
+    assert found is not None
+    assert found["reason"] == "Malicious"
+
+    found = temp_registry.find_blacklist(uuid="6de6a3bf-a524-42b6-83cb-a36b2ec2e246")
+    assert found is not None
+    assert found["reason"] == "Broken"
+
+    assert temp_registry.find_blacklist(url="https://github.com/good/plugin") is None
+
+    temp_registry.remove_blacklist("https://github.com/bad/plugin")
+    assert temp_registry.find_blacklist(url="https://github.com/bad/plugin") is None
+
+
 def test_load_invalid_toml(tmp_path):
     """Test loading invalid TOML shows helpful error."""
     registry_path = tmp_path / "invalid.toml"
@@ -1,8 +1,16 @@
 """Tests for utils module."""
 
+from datetime import (
+    datetime,
+    timezone,
+)
+
 import pytest
 
-from registry_lib.utils import derive_plugin_id
+from registry_lib.utils import (
+    derive_plugin_id,
+    now_iso8601,
+)
 
 
 def test_derive_plugin_id_basic():
@@ -29,7 +37,24 @@ def test_derive_plugin_id_normalize():
     assert derive_plugin_id("https://github.com/user/test__plugin") == "test-plugin"
 
 
+def test_derive_plugin_id_normalize_special_chars():
+    """Test plugin ID normalization of non-ASCII and punctuation characters."""
+    assert derive_plugin_id("https://github.com/user/Plügin.Name") == "pl-gin-name"
+    assert derive_plugin_id("https://github.com/user/_my--plugin_") == "my-plugin"
+    assert derive_plugin_id("https://github.com/user/Picard-Plugin-Tags2") == "tags2"
+
+
 def test_derive_plugin_id_invalid():
     """Test plugin ID derivation with invalid URLs."""
     with pytest.raises(ValueError):
         derive_plugin_id("not-a-url")
+
+
+def test_now_iso8601():
+    """Test current time is formatted as UTC ISO 8601 without microseconds."""
+    before = datetime.now(timezone.utc).replace(microsecond=0)
+    timestamp = now_iso8601()
+    after = datetime.now(timezone.utc)
+
+    assert timestamp.endswith("Z")
+    assert before <= datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc) <= after